@@ -0,0 +1,121 @@
+import json
+import os, sys
+from multiprocessing import Pool
+
+#El runner usa directamente la libreria OPyMM
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "OPyMM"))
+from instancias import lee_instancia, busca_instancias
+from mmrcpsp import Problema, ejecuta_corrida, semilla_corrida
+from resultados import AlmacenResultados, lee_resultados, divide_corridas
+
+
+#Valores por defecto de una campaña
+CAMPANA_DEFECTO = {
+    "instancias": [],
+    "algoritmos": list(range(20)),
+    "experimentos": 10,
+    "semilla": 0,
+    "salida": "resultados",
+    "procesos": 1,
+    "dir_compilados": None,
+    "tam_lote": 10000,
+    "ventana_estancamiento": None,
+    "umbral_estancamiento": 1e-3
+}
+
+
+def lee_campana(ruta):
+    """Lee la descripcion de una campaña en JSON y completa las claves que falten con CAMPANA_DEFECTO.
+    instancias es una lista de ficheros (.mm o .json) o directorios, algoritmos son indices de
+    tabla_algoritmos y experimentos el numero de corridas por instancia y algoritmo.
+    Los resultados se guardan en el almacen de salida, en lotes de tam_lote filas.
+    Con ventana_estancamiento las corridas paran por estancamiento del hipervolumen (ver mmrcpsp.estancamiento_termination).
+    Las rutas relativas se toman respecto al fichero de la campaña
+    """
+
+    with open(ruta) as f:
+        campana = dict(CAMPANA_DEFECTO, **json.load(f))
+
+    base = os.path.dirname(os.path.abspath(ruta))
+    for clave in ("salida", "dir_compilados"):
+        if campana[clave] is not None:
+            campana[clave] = os.path.join(base, campana[clave])
+    campana["instancias"] = [os.path.join(base, i) for i in campana["instancias"]]
+
+    return campana
+
+
+def nombre_instancia(ruta):
+    return os.path.splitext(os.path.basename(ruta))[0]
+
+
+def celdas(campana):
+    """Genera las celdas (instancia x algoritmo x experimento) de la campaña que aun no tienen resultados
+    en el almacen. Cada celda lleva la semilla derivada con semilla_corrida, la misma que usaria resuelve
+    """
+
+    hechas = {clave for clave, _ in divide_corridas(lee_resultados(campana["salida"]))}
+
+    rutas = []
+    for ruta in campana["instancias"]:
+        if os.path.isdir(ruta):
+            rutas.extend(busca_instancias(ruta, (".mm", ".json")))
+        else:
+            rutas.append(ruta)
+
+    for ruta in rutas:
+        for alg in campana["algoritmos"]:
+            for experimento in range(campana["experimentos"]):
+                semilla = semilla_corrida(campana["semilla"], alg, experimento)
+
+                if (nombre_instancia(ruta), alg, semilla, experimento) not in hechas:
+                    yield ruta, alg, experimento, semilla, campana["dir_compilados"], campana["ventana_estancamiento"], campana["umbral_estancamiento"]
+
+
+#Problemas ya construidos en este proceso, por ruta de la instancia
+_problemas = {}
+
+
+def ejecuta_celda(celda):
+    """Ejecuta una celda y devuelve la fila del almacen de resultados con los objetivos de su poblacion final
+    """
+
+    ruta, alg, experimento, semilla, dir_compilados, ventana_estancamiento, umbral_estancamiento = celda
+
+    if ruta not in _problemas:
+        _problemas[ruta] = Problema(**lee_instancia(ruta), dir_compilados = dir_compilados)
+
+    final_pop, generaciones, _ = ejecuta_corrida(_problemas[ruta], alg, semilla, ventana_estancamiento = ventana_estancamiento,
+                                                 umbral_estancamiento = umbral_estancamiento)
+
+    return nombre_instancia(ruta), alg, semilla, experimento, generaciones, [indiv.fitness for indiv in final_pop]
+
+
+def ejecuta_campana(campana):
+    """Ejecuta las celdas pendientes de la campaña, repartidas entre campana["procesos"] procesos.
+    Volver a lanzar una campaña, o ampliarla con mas instancias, algoritmos o experimentos, solo ejecuta lo que falta.
+    Los resultados se escriben por lotes; si se interrumpe, las celdas del lote sin escribir se repiten al relanzarla
+    """
+
+    pendientes = list(celdas(campana))
+    print("Celdas pendientes: ", len(pendientes))
+
+    with AlmacenResultados(campana["salida"], campana["tam_lote"]) as almacen:
+        if campana["procesos"] > 1:
+            with Pool(processes = campana["procesos"]) as pool:
+                resultados = pool.imap_unordered(ejecuta_celda, pendientes)
+                for hechas, resultado in enumerate(resultados, 1):
+                    almacen.anade(*resultado)
+                    print(hechas, "/", len(pendientes), *resultado[:4])
+        else:
+            for hechas, celda in enumerate(pendientes, 1):
+                resultado = ejecuta_celda(celda)
+                almacen.anade(*resultado)
+                print(hechas, "/", len(pendientes), *resultado[:4])
+
+    return 0
+
+
+if __name__ == '__main__':
+
+    ejecuta_campana(lee_campana(sys.argv[1] if len(sys.argv) > 1 else os.path.join(os.path.dirname(os.path.abspath(__file__)), "campana.json")))
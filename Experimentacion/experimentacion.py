@@ -1,9 +1,13 @@
-from pandas import *
-from is_pareto import devuelve_pareto_from_csv, is_pareto_efficient, devuelve_pareto_from_list_csv
+from multiprocessing import Pool
 import numpy as np
 import csv
+import os, sys
 
-from jmetal.core.quality_indicator import HyperVolume, InvertedGenerationalDistance, EpsilonIndicator
+#El frente de Pareto, los indicadores de calidad y el almacen de resultados estan en la libreria OPyMM
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "OPyMM"))
+from is_pareto import is_pareto
+from indicadores import evalua_frentes
+from resultados import AlmacenResultados, importa_csv, lee_resultados, divide_corridas
 
 #Lista de cadenas con los nombres de los archivos
 f_algoritmos = []
@@ -89,96 +93,145 @@ mut_modo = "mutacion modo"
 op_mutacion = []
 op_mutacion.append(mut_actv)
 op_mutacion.append(mut_modo)
+#Configuraciones 21 a 30, sin resultados publicados
+mut_conjunta = "mutacion conjunta"
+op_mutacion.append(mut_conjunta)
+#Configuraciones 31 a 40: las de cruce en n puntos (6 a 10 y 16 a 20) con cruce_n_puntos, sin resultados publicados
+cruce_nativo = "cruce n puntos nativo"
+#Configuraciones 41 a 50: las de cruce uniforme (1 a 5 y 11 a 15) con el cruce sesgado, sin resultados publicados
+cruce_sesgado = "cruce sesgado"
 
 
-for problema in problemas:
+def operador_configuracion(configuracion):
+    """Operador de mutacion con el que se etiqueta la configuracion (indice en tabla_algoritmos)
+    """
 
-    tiempo_M = -1
-    coste_M = -1
+    if configuracion < len(op_mutacion)*len(f_algoritmos):
+        return op_mutacion[configuracion // len(f_algoritmos)]
 
-    list_files = []
-    for op in op_mutacion:
+    #10 configuraciones de cada cruce nuevo, 5 por operador de mutacion
+    resto = configuracion - len(op_mutacion)*len(f_algoritmos)
+    cruce = [cruce_nativo, cruce_sesgado][resto // 10]
 
-        for algoritmo in f_algoritmos:
+    return op_mutacion[(resto % 10) // 5]+", "+cruce
 
-            list_files.append(problema+"/"+op+"/"+algoritmo)
 
-            #Obtencion de punto de referencia para HV
-            csv_rr = read_csv(problema+"/"+op+"/"+algoritmo)
-            x_tiempo = csv_rr['tiempo'].tolist()
-            y_coste = csv_rr['coste'].tolist()
+def importa_publicados(almacen_publicados):
+    """Crea el almacen de resultados a partir de los .csv publicados, donde cada configuracion
+    tiene sus 10 corridas de 100 individuos seguidas. La configuracion es el indice en tabla_algoritmos
+    """
 
-            x_tiempo_M = max(x_tiempo)
-            y_coste_M = max(y_coste)
+    with AlmacenResultados(almacen_publicados) as almacen:
+        for problema in problemas:
+            for i_op, op in enumerate([mut_actv, mut_modo]):
+                for i_alg, algoritmo in enumerate(f_algoritmos):
+                    importa_csv(almacen, problema+"/"+op+"/"+algoritmo, problema, len(f_algoritmos)*i_op + i_alg)
 
-            if x_tiempo_M > tiempo_M:
-                tiempo_M = x_tiempo_M
-            if y_coste_M > coste_M:
-                coste_M = y_coste_M
+    return 0
 
 
-    #Escribimos pareto optimo aproximado de referencia
-    pareto_ref = devuelve_pareto_from_list_csv(list_files)
+def frente(objetivos):
+    return objetivos[is_pareto(objetivos)]
+
+
+def metricas_problema(trabajo):
+    """Calcula en una sola pasada, con los objetivos de todas las corridas de un problema ya en memoria,
+    el frente y el punto de referencia, los indicadores de cada configuracion (union de sus corridas)
+    y los de cada corrida, y los escribe en directorio/problema
+    """
+
+    problema, corridas, directorio = trabajo
+
+    configuraciones = sorted({configuracion for configuracion, _, _ in corridas})
+
+    frentes_configuracion = [frente(np.vstack([objetivos for c, _, objetivos in corridas if c == configuracion]))
+                             for configuracion in configuraciones]
+    frentes_corrida = [frente(objetivos) for _, _, objetivos in corridas]
+
+    #Pareto optimo aproximado de referencia y punto de referencia para el HV (peor valor de cada objetivo)
+    pareto_ref = frente(np.vstack(frentes_configuracion))
+    pto_referencia = np.max([objetivos.max(axis = 0) for _, _, objetivos in corridas], axis = 0)
 
-    with open(problema+"/"+"pareto_ref_"+problema+".csv", mode='w') as f_csv:
+    #Punto de referencia del hipervolumen ligeramente por detras del peor punto
+    pto_referencia_hv = pto_referencia*(1+1/(1000-1))
+
+    #Indicadores de las configuraciones y de las corridas en una sola llamada
+    hvs, igds, eis = evalua_frentes(frentes_configuracion + frentes_corrida, pto_referencia_hv, pareto_ref)
+    n_conf = len(configuraciones)
+
+    ruta = os.path.join(directorio, problema)
+    os.makedirs(ruta, exist_ok = True)
+
+    #Escribimos pareto optimo aproximado de referencia
+    with open(os.path.join(ruta, "pareto_ref_"+problema+".csv"), mode='w') as f_csv:
         csv_writer = csv.writer(f_csv, delimiter=',', quotechar='"', quoting=csv.QUOTE_MINIMAL)
 
         csv_writer.writerow(["tiempo", "coste"])
-
-        for pto in pareto_ref:
-            csv_writer.writerow([pto[0], pto[1]])
+        csv_writer.writerows(pareto_ref.tolist())
 
     #Escribimos el punto de refenrecia para el HV
-    with open(problema+"/"+"punto_referencia_hv_"+problema+".csv", mode='w') as f_csv:
+    with open(os.path.join(ruta, "punto_referencia_hv_"+problema+".csv"), mode='w') as f_csv:
         csv_writer = csv.writer(f_csv, delimiter=',', quotechar='"', quoting=csv.QUOTE_MINIMAL)
 
         csv_writer.writerow(["tiempo", "coste"])
-
-        csv_writer.writerow([tiempo_M, coste_M])
+        csv_writer.writerow(pto_referencia.tolist())
 
     #Numero de soluciones (cardinalidad) que forman el conjunto de pareto optimo aproximado
-    with open(problema+"/"+"cardinalidad_pareto_aprox_"+problema+".csv", mode='w') as f_csv:
+    with open(os.path.join(ruta, "cardinalidad_pareto_aprox_"+problema+".csv"), mode='w') as f_csv:
         csv_writer = csv.writer(f_csv, delimiter=',', quotechar='"', quoting=csv.QUOTE_MINIMAL)
 
         csv_writer.writerow(["Cardinalidad del conjunto de pareto optimo aproximado"])
-
         csv_writer.writerow([len(pareto_ref)])
 
-#Calculo de los indicadores de calidad
-for problema in problemas:
-    csv_pr = read_csv(problema+"/"+"pareto_ref_"+problema+".csv")
-    csv_rr = read_csv(problema+"/"+"punto_referencia_hv_"+problema+".csv")
+    #Indicadores de calidad por configuracion
+    with open(os.path.join(ruta, "metricas_calidad_"+problema+".csv"), mode='w') as f_csv:
+        csv_writer = csv.writer(f_csv, delimiter=',', quotechar='"', quoting=csv.QUOTE_MINIMAL)
+        csv_writer.writerow(["Algoritmo (operador de mutacion)", "Hipervolumen", "IGD", "Epsilon", "Cardinalidad del cto. de soluciones no-dominadas"])
 
-    x_pr = csv_pr["tiempo"]
-    y_pr = csv_pr["coste"]
+        for i, configuracion in enumerate(configuraciones):
 
-    pareto_referencia = [[x_pr[i], y_pr[i]] for i in range(len(x_pr))]
-    pto_referencia = [float(csv_rr["tiempo"]), float(csv_rr["coste"])]
+            #Redondeado hv en 2 decimales e IGD y epsilon en 4
+            op = operador_configuracion(configuracion)
+            csv_writer.writerow([problema+" ("+op+")", round(hvs[i],2), round(igds[i],4), round(eis[i],4), len(frentes_configuracion[i])])
 
-    #Declaramos los indicadores
-    hv = HyperVolume([pto_referencia[0]*(1+1/(1000-1)), pto_referencia[1]*(1+1/(1000-1))])
-    hv.is_minimization = True
+    #Indicadores de calidad de cada corrida, para los boxplots
+    with open(os.path.join(ruta, "metricas_corridas_"+problema+".csv"), mode='w') as f_csv:
+        csv_writer = csv.writer(f_csv, delimiter=',', quotechar='"', quoting=csv.QUOTE_MINIMAL)
+        csv_writer.writerow(["Configuracion", "Corrida", "Hipervolumen", "IGD", "Epsilon"])
 
-    igd = InvertedGenerationalDistance(pareto_referencia)
+        for i, (configuracion, corrida, _) in enumerate(corridas):
+            csv_writer.writerow([configuracion, corrida, hvs[n_conf+i], igds[n_conf+i], eis[n_conf+i]])
 
-    ei = EpsilonIndicator(pareto_referencia)
+    return problema
+
+
+def calcula_metricas(almacen, directorio = "metricas", procesos = None):
+    """Lee una sola vez el almacen de resultados, lo separa por problema y reparte el calculo
+    de las metricas de cada problema entre procesos
+    """
+
+    por_problema = {}
+    for (problema, configuracion, _, corrida), objetivos in divide_corridas(lee_resultados(almacen)):
+        por_problema.setdefault(problema, []).append((configuracion, corrida, objetivos))
+
+    trabajos = [(problema, corridas, directorio) for problema, corridas in por_problema.items()]
+
+    with Pool(processes = procesos) as pool:
+        for problema in pool.imap_unordered(metricas_problema, trabajos):
+            print("Metricas de ", problema, " calculadas")
+
+    return 0
 
-    with open(problema+"/"+"metricas_calidad_"+problema+".csv", mode='w') as f_csv:
-        csv_writer = csv.writer(f_csv, delimiter=',', quotechar='"', quoting=csv.QUOTE_MINIMAL)
-        csv_writer.writerow(["Algoritmo (operador de mutacion)", "Hipervolumen", "IGD", "Epsilon", "Cardinalidad del cto. de soluciones no-dominadas"])
 
-        for op in op_mutacion:
-            for algoritmo in f_algoritmos:
+if __name__ == '__main__':
 
-                frente_raw = devuelve_pareto_from_csv(problema+"/"+op+"/"+algoritmo)
-                frente = [[pfr[0], pfr[1]] for pfr in frente_raw]
+    #Por defecto, los resultados publicados; si no, el almacen de una campaña (campana.py)
+    almacen = sys.argv[1] if len(sys.argv) > 1 else "resultados_publicados"
+    #Las metricas publicadas (directorios de cada problema) corresponden a las graficas de imgs_boxplots,
+    #asi que las nuevas se escriben aparte salvo que se indique otro directorio
+    directorio = sys.argv[2] if len(sys.argv) > 2 else "metricas"
 
-                #Hipervolumen
-                hv_calculado = hv.compute(frente)
-                #IGD
-                igd_calculado = igd.compute(frente)
-                #epsilon aditivo
-                ei_calculado = ei.compute(frente)
+    if len(sys.argv) == 1 and not os.path.isdir(almacen):
+        importa_publicados(almacen)
 
-                #Redondeado hv en 2 decimales e IGD y epsilon en 4
-                csv_writer.writerow([problema+" ("+op+")", round(hv_calculado,2), round(igd_calculado,4), round(ei_calculado,4), len(frente)])
+    calcula_metricas(almacen, directorio)
@@ -1,11 +1,6 @@
 from random import Random
-import time
 import inspyred
 import numpy as np
-import matplotlib.pyplot as plt
-
-from pymoo.factory import get_performance_indicator
-
 import csv
 
 rand = Random()
@@ -0,0 +1,70 @@
+#Benchmark del tiempo de arranque de los modulos del resolvedor. Cada medida es un interprete nuevo,
+#como los procesos trabajadores, y se resta el arranque del interprete vacio.
+#Termina con error si algun modulo carga dependencias pesadas que el resolvedor no necesita o si
+#la mediana supera el limite:
+#
+#    python bench_arranque.py --repeticiones 10 --limite 1.0
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+
+#Modulos que se miden
+MODULOS = ["mmrcpsp", "instancias", "resultados", "indicadores", "opymm_cli"]
+
+#Dependencias que no se deben cargar al importar el resolvedor
+PROHIBIDOS = ["matplotlib", "pymoo", "PySimpleGUI", "win32api", "pandas", "jmetal"]
+
+
+def mide(codigo, repeticiones):
+    """Mediana en segundos de ejecutar codigo en un interprete nuevo con el directorio de OPyMM como actual
+    """
+
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        subprocess.run([sys.executable, "-c", codigo], cwd = os.path.dirname(os.path.abspath(__file__)), check = True)
+        tiempos.append(time.perf_counter() - inicio)
+
+    return statistics.median(tiempos)
+
+
+def cargados(modulo):
+    """Dependencias prohibidas que quedan en sys.modules tras importar modulo
+    """
+
+    codigo = "import sys, {}; print(' '.join(m for m in {} if m in sys.modules))".format(modulo, PROHIBIDOS)
+    salida = subprocess.run([sys.executable, "-c", codigo], cwd = os.path.dirname(os.path.abspath(__file__)),
+                            check = True, capture_output = True, text = True)
+
+    return salida.stdout.split()
+
+
+def main(args = None):
+    parser = argparse.ArgumentParser(description = "Tiempo de arranque de los modulos del resolvedor")
+    parser.add_argument("--repeticiones", type = int, default = 10)
+    parser.add_argument("--limite", type = float, default = 1.0, help = "segundos maximos de importacion por modulo")
+    args = parser.parse_args(args)
+
+    base = mide("pass", args.repeticiones)
+    print("Interprete vacio: {:.3f} s".format(base))
+
+    fallos = 0
+    for modulo in MODULOS:
+        tiempo = mide("import " + modulo, args.repeticiones) - base
+        prohibidos = cargados(modulo)
+
+        print("{:<12} {:.3f} s {}".format(modulo, tiempo, " ".join(prohibidos)))
+
+        if tiempo > args.limite or prohibidos:
+            fallos += 1
+
+    return 1 if fallos else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
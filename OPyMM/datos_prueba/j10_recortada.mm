@@ -0,0 +1,44 @@
+************************************************************************
+file with basedata            : mm10_.bas
+initial value random generator: 28123
+************************************************************************
+projects                      :  1
+jobs (incl. supersource/sink ):  6
+horizon                       :  31
+RESOURCES
+  - renewable                 :  2   R
+  - nonrenewable              :  2   N
+  - doubly constrained        :  0   D
+************************************************************************
+PROJECT INFORMATION:
+pronr.  #jobs rel.date duedate tardcost  MPM-Time
+    1      4      0       12        4       12
+************************************************************************
+PRECEDENCE RELATIONS:
+jobnr.    #modes  #successors   successors
+   1        1          3           2   3   4
+   2        3          1           5
+   3        2          1           5
+   4        1          1           6
+   5        3          1           6
+   6        1          0        
+************************************************************************
+REQUESTS/DURATIONS:
+jobnr. mode duration  R 1  R 2  N 1  N 2
+------------------------------------------------------------------------
+  1      1     0       0    0    0    0
+  2      1     3       4    0    5    0
+         2     5       0    2    0    3
+         3     6       1    1    2    2
+  3      1     2       3    3    0    4
+         2     4       2    0    1    1
+  4      1     1       0    5    6    0
+  5      1     2       2    2    0    0
+         2     3       1    1    3    0
+         3     7       0    1    0    1
+  6      1     0       0    0    0    0
+************************************************************************
+RESOURCEAVAILABILITIES:
+  R 1  R 2  N 1  N 2
+    6    7   20   15
+************************************************************************
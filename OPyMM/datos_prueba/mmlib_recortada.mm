@@ -0,0 +1,25 @@
+************************************************************************
+file with basedata	: J5_recortada.bas
+************************************************************************
+PRECEDENCE RELATIONS
+jobnr.	#modes	#successors	successors
+1	1	2	2	3
+2	2	1	4
+3	1	1	4
+4	1	0
+************************************************************************
+REQUESTS/DURATIONS
+jobnr.	mode	dur	R1	D1	N1
+------------------------------------------------------------------------
+1	1	0	0	0	0
+2	1	4	3	2	1
+	2	2	5
+		4	0
+3	1	3
+		1	1	2
+4	1	0	0	0	0
+************************************************************************
+RESOURCE AVAILABILITIES
+R1	D1	N1
+8	6	9
+************************************************************************
@@ -0,0 +1,95 @@
+import numpy as np
+
+
+def hipervolumen(frente, referencia):
+    """Hipervolumen exacto de un frente de dos objetivos (minimizacion) respecto al punto de referencia.
+    Solo cuentan los puntos que no son peores que la referencia en ningun objetivo, como en jmetal.
+    Se ordena por el primer objetivo y se barre acumulando el mejor segundo objetivo
+    """
+
+    frente = np.asarray(frente, dtype = float).reshape(-1, 2)
+    referencia = np.asarray(referencia, dtype = float)
+
+    frente = frente[np.all(frente <= referencia, axis = 1)]
+
+    if len(frente) == 0:
+        return 0.0
+
+    orden = np.lexsort((frente[:, 1], frente[:, 0]))
+    x = frente[orden, 0]
+    mejor_y = np.minimum.accumulate(frente[orden, 1])
+
+    #Cada punto aporta la franja hasta el siguiente en el primer objetivo
+    ancho = np.diff(np.append(x, referencia[0]))
+
+    return float(np.sum(ancho * (referencia[1] - mejor_y)))
+
+
+def _agrupa(frentes):
+    """Concatena una lista de frentes en un unico array y devuelve donde empieza cada uno
+    """
+
+    frentes = [np.asarray(f, dtype = float).reshape(-1, 2) for f in frentes]
+    tamaños = np.array([len(f) for f in frentes])
+
+    if np.any(tamaños == 0):
+        raise ValueError("No se pueden evaluar frentes vacios")
+
+    inicios = np.concatenate(([0], np.cumsum(tamaños)[:-1]))
+
+    return np.vstack(frentes), inicios
+
+
+def igd(frentes, frente_referencia):
+    """Distancia generacional invertida: media, sobre los puntos del frente de referencia, de la distancia
+    euclidea al punto mas cercano del frente evaluado (igual que InvertedGenerationalDistance de jmetal).
+    Recibe una lista de frentes y devuelve un array con el IGD de cada uno
+    """
+
+    puntos, inicios = _agrupa(frentes)
+    frente_referencia = np.asarray(frente_referencia, dtype = float)
+
+    distancias = np.linalg.norm(frente_referencia[:, None, :] - puntos[None, :, :], axis = 2)
+
+    #Minimo por frente de cada punto de referencia y media sobre la referencia
+    return np.minimum.reduceat(distancias, inicios, axis = 1).mean(axis = 0)
+
+
+def epsilon_aditivo(frentes, frente_referencia):
+    """Indicador epsilon aditivo: menor desplazamiento que hay que aplicar a cada frente para que
+    cubra al de referencia (igual que EpsilonIndicator de jmetal).
+    Recibe una lista de frentes y devuelve un array con el epsilon de cada uno
+    """
+
+    puntos, inicios = _agrupa(frentes)
+    frente_referencia = np.asarray(frente_referencia, dtype = float)
+
+    diferencias = np.max(puntos[None, :, :] - frente_referencia[:, None, :], axis = 2)
+
+    return np.minimum.reduceat(diferencias, inicios, axis = 1).max(axis = 0)
+
+
+def evalua_frentes(frentes, punto_referencia, frente_referencia):
+    """Calcula hipervolumen, IGD y epsilon aditivo de varios frentes frente a una misma referencia.
+    Devuelve tres arrays con un valor por frente
+    """
+
+    hvs = np.array([hipervolumen(frente, punto_referencia) for frente in frentes])
+
+    return hvs, igd(frentes, frente_referencia), epsilon_aditivo(frentes, frente_referencia)
+
+
+def contribuciones_hipervolumen(frentes, punto_referencia):
+    """Contribucion exclusiva de cada frente al hipervolumen de la union de todos: lo que se pierde
+    al quitar ese frente. Los frentes pueden estar vacios. Devuelve un array con un valor por frente;
+    las diferencias del orden del error de redondeo se dejan en cero
+    """
+
+    frentes = [np.asarray(f, dtype = float).reshape(-1, 2) for f in frentes]
+    vacio = [np.zeros((0, 2))]
+    total = hipervolumen(np.vstack(vacio + frentes), punto_referencia)
+
+    contribuciones = np.array([total - hipervolumen(np.vstack(vacio + frentes[:i] + frentes[i+1:]), punto_referencia)
+                               for i in range(len(frentes))])
+
+    return np.where(contribuciones > 1e-9*total, contribuciones, 0.0)
@@ -0,0 +1,207 @@
+import json
+import os
+import re
+
+
+#Columnas de recursos en las cabeceras: "R 1", "N 2", "D 1" (PSPLIB) o "R1", "N2" (MMLIB)
+_COLUMNA_RECURSO = re.compile(r"\b([RND])\s*\d+")
+
+
+def _secciones(lineas):
+    """Recorre las lineas de un fichero .mm y devuelve pares (seccion, linea) con el nombre de la
+    seccion a la que pertenece cada linea de datos. Los separadores de asteriscos y guiones se descartan
+    """
+
+    seccion = None
+
+    for linea in lineas:
+        limpia = linea.strip()
+
+        if limpia == "" or limpia.startswith("***") or limpia.startswith("---"):
+            continue
+
+        mayus = limpia.upper()
+        if mayus.startswith("PRECEDENCE RELATIONS"):
+            seccion = "precedencias"
+            continue
+        if mayus.startswith("REQUESTS/DURATIONS"):
+            seccion = "duraciones"
+            continue
+        if mayus.startswith("RESOURCEAVAILABILITIES") or mayus.startswith("RESOURCE AVAILABILITIES"):
+            seccion = "disponibilidad"
+            continue
+        if mayus.startswith("PROJECT INFORMATION") or mayus.startswith("RESOURCES") or ":" in limpia:
+            seccion = None
+            continue
+
+        if seccion is not None:
+            yield seccion, limpia
+
+
+def lee_mm(fichero, coste_rnr = None, coste_fijo = None, quita_ficticias = True):
+    """Lee una instancia multimodo en formato PSPLIB (.mm) o MMLIB linea a linea y devuelve un diccionario
+    con los argumentos del constructor de Problema: recursos_modo, dias_modo, lim_recursos, Mn,
+    predecesores, coste_fijo, coste_rnr y rnr_modo.
+
+    fichero puede ser una ruta o un objeto fichero abierto.
+    Los ficheros no traen costes: por defecto cada unidad de recurso no renovable cuesta 1 y el coste fijo
+    de cada modo es 0. Se pueden pasar coste_rnr (uno por recurso no renovable) y coste_fijo (por actividad y modo).
+    Con quita_ficticias se eliminan la actividad inicial y final de duracion 0 y las actividades se
+    numeran desde 0, igual que en las instancias de Experimentacion.
+    Los recursos doblemente restringidos cuentan como renovables y como no renovables.
+    La linea de un modo puede continuar en las siguientes, el numero de modos de cada actividad sale
+    de las relaciones de precedencia
+    """
+
+    if isinstance(fichero, (str, bytes, os.PathLike)):
+        with open(fichero) as f:
+            return lee_mm(f, coste_rnr, coste_fijo, quita_ficticias)
+
+    sucesores = {}
+    n_modos = {}
+    modos = {}
+    tipos = None
+    lim = None
+    trabajo = None
+    pendiente = []
+
+    for seccion, linea in _secciones(fichero):
+
+        if _COLUMNA_RECURSO.search(linea) is not None:
+            #Cabecera de columnas, de aqui sale el tipo de cada recurso
+            tipos = _COLUMNA_RECURSO.findall(linea)
+            continue
+
+        campos = linea.split()
+
+        if seccion == "precedencias":
+            if not campos[0].isdigit():
+                continue
+            campos = [int(c) for c in campos]
+            n_modos[campos[0]] = campos[1]
+            sucesores[campos[0]] = campos[3:3 + campos[2]]
+
+        elif seccion == "duraciones":
+            if tipos is None or not campos[0].isdigit():
+                continue
+            if len(n_modos) == 0:
+                raise ValueError("El fichero no tiene las relaciones de precedencia antes de las duraciones")
+            pendiente.extend(int(c) for c in campos)
+
+            #Tras el ultimo modo de una actividad viene el numero de la siguiente; las lineas de un modo que
+            #no es el primero no lo repiten. Con muchos recursos un modo puede ocupar varias lineas
+            nuevo = trabajo is None or len(modos[trabajo]) == n_modos.get(trabajo, 1)
+            if len(pendiente) < len(tipos) + (3 if nuevo else 2):
+                continue
+
+            if nuevo:
+                trabajo = pendiente[0]
+                pendiente = pendiente[1:]
+            modos.setdefault(trabajo, []).append(pendiente[1:])
+            pendiente = []
+
+        elif seccion == "disponibilidad":
+            if campos[0].isdigit():
+                lim = [int(c) for c in campos]
+
+    if tipos is None or lim is None or len(modos) == 0:
+        raise ValueError("El fichero no tiene el formato PSPLIB multimodo esperado")
+
+    renovables = [r for r, t in enumerate(tipos) if t in ("R", "D")]
+    no_renovables = [r for r, t in enumerate(tipos) if t in ("N", "D")]
+
+    trabajos = sorted(modos)
+    if quita_ficticias and modos[trabajos[0]][0][0] == 0 and modos[trabajos[-1]][0][0] == 0:
+        ficticias = {trabajos[0], trabajos[-1]}
+        trabajos = trabajos[1:-1]
+    else:
+        ficticias = set()
+
+    indice = {trabajo: i for i, trabajo in enumerate(trabajos)}
+
+    predecesores = [[] for _ in trabajos]
+    for trabajo, sucs in sucesores.items():
+        if trabajo in ficticias:
+            continue
+        for suc in sucs:
+            if suc not in ficticias:
+                predecesores[indice[suc]].append(indice[trabajo])
+
+    dias_modo = [[modo[0] for modo in modos[trabajo]] for trabajo in trabajos]
+    recursos_modo = [[[modo[1 + r] for r in renovables] for modo in modos[trabajo]] for trabajo in trabajos]
+    rnr_modo = [[[modo[1 + r] for r in no_renovables] for modo in modos[trabajo]] for trabajo in trabajos]
+    Mn = [len(dm) for dm in dias_modo]
+
+    if coste_rnr is None:
+        coste_rnr = [1] * len(no_renovables)
+    if coste_fijo is None:
+        coste_fijo = [[0] * m for m in Mn]
+
+    return {
+        "recursos_modo": recursos_modo,
+        "dias_modo": dias_modo,
+        "lim_recursos": [lim[r] for r in renovables],
+        "Mn": Mn,
+        "predecesores": [sorted(p) for p in predecesores],
+        "coste_fijo": coste_fijo,
+        "coste_rnr": coste_rnr,
+        "rnr_modo": rnr_modo
+    }
+
+
+def lee_json(fichero):
+    """Lee una instancia guardada con guarda_json: un diccionario con los argumentos del constructor de Problema.
+    Sirve para las instancias con costes, que el formato .mm no recoge
+    """
+
+    if isinstance(fichero, (str, bytes, os.PathLike)):
+        with open(fichero) as f:
+            return lee_json(f)
+
+    return json.load(fichero)
+
+
+def guarda_json(instancia, ruta):
+    """Guarda en ruta una instancia (diccionario con los argumentos del constructor de Problema) en formato JSON
+    """
+
+    with open(ruta, "w") as f:
+        json.dump(instancia, f)
+
+    return 0
+
+
+def lee_instancia(ruta, **kwargs):
+    """Lee una instancia .json con lee_json o, con cualquier otra extension, .mm con lee_mm.
+    Los argumentos adicionales se pasan a lee_mm
+    """
+
+    if ruta.lower().endswith(".json"):
+        return lee_json(ruta)
+
+    return lee_mm(ruta, **kwargs)
+
+
+def busca_instancias(directorio, extensiones = (".mm",)):
+    """Generador con las rutas, en orden, de los ficheros de un directorio (y sus subdirectorios) que
+    tienen alguna de las extensiones
+    """
+
+    extensiones = tuple(e.lower() for e in extensiones)
+
+    for raiz, dirs, ficheros in os.walk(directorio):
+        dirs.sort()
+        for nombre in sorted(ficheros):
+            if nombre.lower().endswith(extensiones):
+                yield os.path.join(raiz, nombre)
+
+
+def recorre_instancias(directorio, extensiones = (".mm",), **kwargs):
+    """Generador que recorre un directorio (y sus subdirectorios) en orden y devuelve (ruta, instancia)
+    para cada fichero con alguna de las extensiones. Cada instancia se lee solo cuando se pide, asi se
+    pueden resolver conjuntos completos como j30, j50 o j100 sin cargarlos en memoria.
+    Los argumentos adicionales se pasan a lee_mm
+    """
+
+    for ruta in busca_instancias(directorio, extensiones):
+        yield ruta, lee_instancia(ruta, **kwargs)
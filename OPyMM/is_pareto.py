@@ -4,11 +4,33 @@ import inspyred
 
 def is_pareto(sols):
     """Devuelve una mascara con el frente de Pareto a partir de las soluciones
-    en un array de tuplas
+    en un array de tuplas. De las soluciones repetidas solo se marca la primera
+
+    Con dos objetivos se ordena lexicograficamente y se recorre una sola vez guardando
+    el menor segundo objetivo visto, O(n log n). Con mas objetivos se descartan las
+    dominadas por cada candidato
     """
 
-    pareto = np.arange(sols.shape[0])
+    sols = np.asarray(sols)
     n_sols = sols.shape[0]
+
+    if n_sols == 0:
+        return np.zeros(0, dtype = bool)
+
+    if sols.shape[1] == 2:
+        #Orden por primer objetivo, luego segundo y luego posicion para que entre repetidas quede la primera
+        orden = np.lexsort((np.arange(n_sols), sols[:, 1], sols[:, 0]))
+        segundo = sols[orden, 1]
+
+        #Es no dominada si mejora el segundo objetivo de todas las anteriores en el orden
+        mejor_anterior = np.minimum.accumulate(np.concatenate(([np.inf], segundo[:-1])))
+
+        pareto_mask = np.zeros(n_sols, dtype = bool)
+        pareto_mask[orden[segundo < mejor_anterior]] = True
+
+        return pareto_mask
+
+    pareto = np.arange(n_sols)
     siguiente = 0
 
     while siguiente < len(sols):
@@ -29,6 +51,21 @@ def is_pareto(sols):
 
 
 
+def devuelve_pareto_from_lists(tiempo, coste):
+    """" Devuelve el conjunto de soluciones no-dominadas a partir de las listas
+         tiempo y coste
+    """
+
+    sols = [(tiempo[i],coste[i]) for i in range(len(tiempo))]
+
+    mask = is_pareto(np.array(sols))
+
+    pareto_set = [[sols[i][0], sols[i][1]] for i in np.flatnonzero(mask)]
+
+    return pareto_set
+
+
+
 def devuelve_pareto(candidatos):
     """ Recibe el conjunto de cromosomas y usando la funcion is_pareto
     devuelve el conjunto de los cromosomas que forma el frente de Pareto
@@ -39,12 +76,199 @@ def devuelve_pareto(candidatos):
     tupla_set = [(indiv.fitness[0], indiv.fitness[1]) for indiv in candidatos]
     mask = is_pareto(np.array(tupla_set))
 
-    pareto_set = []
+    pareto_set = [candidatos[i] for i in np.flatnonzero(mask)]
+
+    return pareto_set
+
+
+def devuelve_pareto_from_file(f_name_x, f_name_y):
+    """" Devuelve el conjunto de soluciones no-dominadas a partir de dos
+         archivos con soluciones
+    """
+
+    f_x = open(f_name_x, 'r')
+    x_total = f_x.readline()
+
+    x_total = x_total.replace('[','').replace(']','').replace(' ','')
+    x_tiempo = x_total.split(',')
+
+    for i, x in enumerate(x_tiempo):
+        x_tiempo[i] = float(x)
+
+    f_y = open(f_name_y, 'r')
+    y_total = f_y.readline()
+
+    y_total = y_total.replace('[','').replace(']','').replace(' ','')
+    y_coste = y_total.split(',')
+
+    for i, y in enumerate(y_coste):
+        y_coste[i] = float(y)
+
+
+    tupla_set = list(zip(x_tiempo, y_coste))
+
+    mask = is_pareto(np.array(tupla_set))
+
+    pareto_set = [tupla_set[i] for i in np.flatnonzero(mask)]
+
+    return pareto_set
+
+
+def devuelve_pareto_from_csv(f_name):
+    """" Devuelve el conjunto de soluciones no-dominadas a partir de un
+         archivo en formato .csv con soluciones
+    """
+
+    from pandas import read_csv
+
+    csv = read_csv(f_name)
+
+    x_tiempo = csv['tiempo'].astype(float).tolist()
+    y_coste = csv['coste'].astype(float).tolist()
+
+    tupla_set = list(zip(x_tiempo, y_coste))
+
+    mask = is_pareto(np.array(tupla_set))
+
+    pareto_set = [tupla_set[i] for i in np.flatnonzero(mask)]
+
+    return pareto_set
+
+def devuelve_pareto_from_list_csv(list_fs):
+    """" Devuelve el conjunto de soluciones no-dominadas a partir de una
+         lista de archivos en formato .csv con soluciones
+    """
 
-    i = 0
-    for punto_pareto in mask.tolist():
-        if punto_pareto:
-            pareto_set.append(candidatos[i])
-        i += 1
+    paretos = []
+    for f_csv in list_fs:
+        paretos = paretos + devuelve_pareto_from_csv(f_csv)
+
+    mask = is_pareto(np.array(paretos))
+
+    pareto_set = [paretos[i] for i in np.flatnonzero(mask)]
 
     return pareto_set
+
+
+def distancia_crowding(puntos):
+    """Devuelve la distancia de crowding de cada punto de un frente (array de tuplas),
+    los extremos de cada objetivo tienen distancia infinita
+    """
+
+    n_puntos, n_obj = puntos.shape
+    distancia = np.zeros(n_puntos)
+
+    if n_puntos < 3:
+        distancia[:] = np.inf
+        return distancia
+
+    for k in range(n_obj):
+        orden = np.argsort(puntos[:, k], kind = 'stable')
+        valores = puntos[orden, k]
+        rango = valores[-1] - valores[0]
+
+        distancia[orden[0]] = distancia[orden[-1]] = np.inf
+
+        if rango > 0:
+            distancia[orden[1:-1]] += (valores[2:] - valores[:-2]) / rango
+
+    return distancia
+
+
+class ArchivoPareto:
+    """ Archivo incremental de soluciones no-dominadas. Las soluciones (cualquier objeto con
+        fitness, como los individuos de inspyred) se insertan segun se obtienen y las dominadas
+        se descartan en el momento, de forma que solo se guarda el frente
+
+        Atributos:
+
+            tam_max - numero maximo de soluciones guardadas, None para no acotar
+
+            criterio - como se acota el archivo cuando supera tam_max:
+                'crowding' descarta una a una las de menor distancia de crowding
+                'epsilon' divide el espacio de objetivos en una rejilla y deja una solucion por celda
+
+            epsilon - tamaño de la celda en cada objetivo para el criterio 'epsilon', si es None
+                se ajusta al rango del frente para que con dos objetivos no queden mas de tam_max
+                celdas ocupadas. Si aun asi se supera tam_max se termina de acotar por crowding
+    """
+
+    def __init__(self, tam_max = None, criterio = 'crowding', epsilon = None):
+
+        if criterio not in ('crowding', 'epsilon'):
+            raise ValueError("El criterio para acotar el archivo debe ser 'crowding' o 'epsilon'")
+
+        self.tam_max = tam_max
+        self.criterio = criterio
+        self.epsilon = epsilon
+
+        self.soluciones = []
+        self.puntos = None
+
+    def __len__(self):
+        return len(self.soluciones)
+
+    def __iter__(self):
+        return iter(self.soluciones)
+
+    def inserta(self, candidatos):
+        """ Inserta las soluciones candidatas y descarta del archivo todas las dominadas
+        """
+
+        candidatos = list(candidatos)
+        if len(candidatos) == 0:
+            return self
+
+        nuevos = np.array([list(c.fitness) for c in candidatos], dtype = float)
+
+        soluciones = self.soluciones + candidatos
+        puntos = nuevos if self.puntos is None else np.vstack((self.puntos, nuevos))
+
+        indices = np.flatnonzero(is_pareto(puntos))
+        self.soluciones = [soluciones[i] for i in indices]
+        self.puntos = puntos[indices]
+
+        if self.tam_max is not None and len(self.soluciones) > self.tam_max:
+            self.acota()
+
+        return self
+
+    def acota(self):
+        """ Reduce el archivo segun el criterio elegido
+        """
+
+        if self.criterio == 'epsilon':
+            minimo = self.puntos.min(axis = 0)
+
+            #Un frente de dos objetivos ocupa como mucho 2m-1 celdas de una rejilla de m x m
+            if self.epsilon is None:
+                epsilon = (self.puntos.max(axis = 0) - minimo) / max((self.tam_max - 1) // 2, 1)
+            else:
+                epsilon = np.asarray(self.epsilon, dtype = float)
+            epsilon = np.where(epsilon > 0, epsilon, 1.0)
+
+            #Se queda en cada celda la solucion mas cercana a su esquina inferior
+            celda_continua = (self.puntos - minimo) / epsilon
+            celdas = np.floor(celda_continua)
+            cercania = np.linalg.norm(celda_continua - celdas, axis = 1)
+
+            orden = np.lexsort((cercania,) + tuple(celdas.T[::-1]))
+            celdas_ordenadas = celdas[orden]
+            primera = np.ones(len(orden), dtype = bool)
+            primera[1:] = np.any(celdas_ordenadas[1:] != celdas_ordenadas[:-1], axis = 1)
+
+            mantener = np.sort(orden[primera])
+
+            self.soluciones = [self.soluciones[i] for i in mantener]
+            self.puntos = self.puntos[mantener]
+
+        mantener = np.arange(len(self.soluciones))
+
+        while len(mantener) > self.tam_max:
+            distancia = distancia_crowding(self.puntos[mantener])
+            mantener = np.delete(mantener, np.argmin(distancia))
+
+        self.soluciones = [self.soluciones[i] for i in mantener]
+        self.puntos = self.puntos[mantener]
+
+        return self
@@ -1,12 +1,16 @@
 from random import Random
+from collections import OrderedDict, deque
+from itertools import count
+from multiprocessing import Pool
+import hashlib
+import json
+import shutil
 import time
 import inspyred
 import numpy as np
-import matplotlib.pyplot as plt
 
-from pymoo.factory import get_performance_indicator
-
-from is_pareto import devuelve_pareto
+from is_pareto import ArchivoPareto
+from indicadores import hipervolumen, contribuciones_hipervolumen
 
 #Pruebas
 import sys, os
@@ -14,82 +18,230 @@ import sys, os
 rand = Random()
 
 
-class CromIterator:
-
-    def __init__(self, cromosoma):
-        self.cromosoma = cromosoma
-        self.indice = 0
+#Tipos de los arrays del cromosoma: claves en coma flotante y modos como enteros pequeños
+TIPO_CLAVE = np.float64
+TIPO_MODO = np.int8
 
-    def __next__(self):
-        if self.indice < len(self.cromosoma.I):
-            resultado = Cromosoma(self.cromosoma.I[self.indice], self.cromosoma.m[self.indice])
-            self.indice += 1
-            return resultado
-        raise StopIteration
 
 class Cromosoma:
     """ Modela la estructura que compete al cromosoma de nuestro AG,
         compuesto y sirviendo tambien como definicion del metodo inicializador.
-            - Lista de claves aleatorias: usado para ver que actividad realizar a partir de las posibles, estadistica
-            - Lista de modos: emparejado posicionalmente con la clave aleatoria, sirve para especificar el  modo de una actividad
+            - Array de claves aleatorias: usado para ver que actividad realizar a partir de las posibles, estadistica
+            - Array de modos: emparejado posicionalmente con la clave aleatoria, sirve para especificar el  modo de una actividad
+        Cada gen es una tupla (clave, modo). Al indexar con un entero se obtiene la tupla y al trocear, un
+        Cromosoma que es una vista de los mismos arrays. Iterar recorre las tuplas sin crear cromosomas
     """
 
+    __slots__ = ('I', 'm')
+
     def __init__(self, random_keys, modes):
-        self.I = random_keys
-        self.m = modes
+        self.I = np.asarray(random_keys, dtype = TIPO_CLAVE)
+        self.m = np.asarray(modes, dtype = TIPO_MODO)
 
     def __iter__(self):
-        return CromIterator(self)
+        return zip(self.I.tolist(), self.m.tolist())
 
     def __getitem__(self, indice):
-        return Cromosoma(self.I[indice], self.m[indice])
+        if isinstance(indice, slice):
+            return Cromosoma(self.I[indice], self.m[indice])
+
+        return self.I[indice].item(), self.m[indice].item()
 
     def __setitem__(self, indice, valor):
-        self.I[indice] = valor.I
-        self.m[indice] = valor.m
+        if isinstance(valor, Cromosoma):
+            self.I[indice] = valor.I
+            self.m[indice] = valor.m
+        else:
+            self.I[indice], self.m[indice] = valor
 
     def __len__(self):
         return len(self.I)
 
+    def __copy__(self):
+        #Copia superficial, comparte los arrays como hacia con las listas
+        return Cromosoma(self.I, self.m)
+
+    def __deepcopy__(self, memo):
+        return Cromosoma(self.I.copy(), self.m.copy())
+
+
+class Poblacion:
+    """ Grupo de cromosomas como estructura de arrays: las claves de todos en un array (individuos x actividades)
+        de TIPO_CLAVE y sus modos en otro de TIPO_MODO. Es un temporal: se apila desde los candidatos cuando hay que
+        evaluar, cruzar o mutar, y cada individuo de inspyred sigue teniendo su Cromosoma
+    """
+
+    __slots__ = ('claves', 'modos')
+
+    def __init__(self, claves, modos):
+        self.claves = np.asarray(claves, dtype = TIPO_CLAVE)
+        self.modos = np.asarray(modos, dtype = TIPO_MODO)
+
+    @classmethod
+    def de_cromosomas(cls, cromosomas):
+        """ Poblacion con una copia de los cromosomas dados, apilados en arrays nuevos
+        """
+        cromosomas = list(cromosomas)
+        if len(cromosomas) == 0:
+            return cls(np.zeros((0, 0)), np.zeros((0, 0)))
+
+        return cls(np.array([c.I for c in cromosomas], dtype = TIPO_CLAVE).reshape(len(cromosomas), -1),
+                   np.array([c.m for c in cromosomas], dtype = TIPO_MODO).reshape(len(cromosomas), -1))
+
+    def __len__(self):
+        return len(self.claves)
+
+    def __getitem__(self, indice):
+        """ Con un entero, el Cromosoma del individuo como vista de su fila; si no, una Poblacion con esas filas
+        """
+        if isinstance(indice, (int, np.integer)):
+            return Cromosoma(self.claves[indice], self.modos[indice])
+
+        return Poblacion(self.claves[indice], self.modos[indice])
+
+    def __iter__(self):
+        return map(Cromosoma, self.claves, self.modos)
+
+    def cromosomas(self):
+        """ Lista de cromosomas con arrays propios, copiados de cada fila, para darlos a individuos: un superviviente
+            no mantiene viva la poblacion entera de la que salio
+        """
+        return [Cromosoma(claves.copy(), modos.copy()) for claves, modos in zip(self.claves, self.modos)]
+
+    def firmas(self):
+        """Firma canonica de cada cromosoma: su vector de modos y el orden de prioridad de las actividades.
+           Solo importa el orden relativo de las claves, por lo que cromosomas con la misma firma
+           se decodifican en la misma planificacion
+        """
+        orden = np.argsort(-self.claves, axis = 1, kind = 'stable')
+
+        return [fila.tobytes() for fila in np.hstack((self.modos, orden)).astype(np.int32)]
+
+
+def _parejas(random, candidates, args):
+    """ Empareja el grupo de cruce como los cruces de inspyred: madres en las posiciones pares, padres en las
+        impares y se descarta el ultimo si son impares. Devuelve madres y padres como Poblacion, que parejas
+        se cruzan segun crossover_rate y un generador de numpy sembrado desde random
+    """
+    grupo = Poblacion.de_cromosomas(candidates[:len(candidates) - len(candidates) % 2])
+    generador = np.random.default_rng(random.getrandbits(64))
+    cruzan = generador.random(len(grupo)//2) < args.setdefault('crossover_rate', 1.0)
+
+    return grupo[0::2], grupo[1::2], cruzan, generador
+
+
+def _hijos(primeros, segundos, mascara_1, mascara_2):
+    """ Hijos de cada pareja como cromosomas nuevos, intercalados: el primero toma el gen de
+        primeros donde mascara_1 y el de segundos en el resto, y el segundo igual con mascara_2
+    """
+    claves = np.empty((2*len(primeros), primeros.claves.shape[1]), dtype = TIPO_CLAVE)
+    modos = np.empty((2*len(primeros), primeros.modos.shape[1]), dtype = TIPO_MODO)
+
+    claves[0::2] = np.where(mascara_1, primeros.claves, segundos.claves)
+    claves[1::2] = np.where(mascara_2, primeros.claves, segundos.claves)
+    modos[0::2] = np.where(mascara_1, primeros.modos, segundos.modos)
+    modos[1::2] = np.where(mascara_2, primeros.modos, segundos.modos)
+
+    return Poblacion(claves, modos).cromosomas()
+
+
+def cruce_uniforme(random, candidates, args):
+    """ Cruce uniforme de todo el grupo de cruce a la vez, equivalente a inspyred.ec.variators.uniform_crossover:
+        en cada pareja que se cruza cada gen (clave y modo) pasa de la madre al primer hijo con probabilidad
+        ux_bias, y del padre al segundo; el resto de genes los heredan al reves
+    """
+    madres, padres, cruzan, generador = _parejas(random, candidates, args)
+    if len(madres) == 0:
+        return []
 
-def busca_posibles(realizadas, ejecutandose, lim_recursos, predecesores):
-    """ Busca las posibles, no contempla las ya realizadas y en_ejecucion
-        Devuelve lista con las actividades que se pueden realizar
+    mascara = (generador.random(madres.claves.shape) < args.setdefault('ux_bias', 0.5)) & cruzan[:, None]
+
+    return _hijos(madres, padres, mascara, ~mascara)
+
+
+def cruce_n_puntos(random, candidates, args):
+    """ Cruce de num_crossover_points puntos de todo el grupo de cruce a la vez: los puntos de corte se eligen
+        sin repeticion y los hijos intercambian los genes de los tramos alternos, empezando tras el primer corte
+    """
+    madres, padres, cruzan, generador = _parejas(random, candidates, args)
+    if len(madres) == 0:
+        return []
+
+    n_parejas, n_acts = madres.claves.shape
+    n_cortes = min(n_acts - 1, args.setdefault('num_crossover_points', 1))
+
+    #Cortes distintos en 1..n_acts-1 de cada pareja y paridad de los cortes hechos antes de cada gen
+    cortes = np.argsort(generador.random((n_parejas, n_acts - 1)), axis = 1)[:, :n_cortes] + 1
+    marcas = np.zeros((n_parejas, n_acts), dtype = np.int8)
+    marcas[np.arange(n_parejas)[:, None], cortes] = 1
+    intercambia = (np.cumsum(marcas, axis = 1) % 2 == 1) & cruzan[:, None]
+
+    return _hijos(padres, madres, ~intercambia, intercambia)
+
+
+def _sustituye_mutados(candidates, filas, mutados):
+    """ Copia al escribir de las mutaciones: mutados es una Poblacion nueva (una copia) con las filas que cambian y
+        se devuelve una lista nueva en la que solo esas posiciones son cromosomas nuevos (con sus propios arrays)
+        y el resto los mismos cromosomas recibidos, sin copiar
+    """
+    hijos = list(candidates)
+    for k, cromosoma in zip(filas.tolist(), mutados.cromosomas()):
+        hijos[k] = cromosoma
+
+    return hijos
+
+
+def calcula_sucesores(predecesores):
+    """ Construye el indice de sucesores de cada actividad y el numero de predecesores
+        (sin repetidos) de cada una, usados por el decodificador para actualizar las posibles
+    """
+
+    sucesores = [[] for _ in range(len(predecesores))]
+    n_predecesores = []
+
+    for actividad, preds in enumerate(predecesores):
+        preds = set(preds)
+        n_predecesores.append(len(preds))
+
+        for pred in preds:
+            sucesores[pred].append(actividad)
+
+    return sucesores, n_predecesores
+
+def actualiza_posibles(posibles, terminadas, pendientes, sucesores):
+    """ Actualiza las posibles cuando terminan actividades, solo se revisan los sucesores
+        de las terminadas descontando un predecesor pendiente a cada uno
         Solo contempla las restinciones temporales
     """
 
-    posibles = []
+    for actividad in terminadas:
+        for sucesor in sucesores[actividad]:
+            pendientes[sucesor] -= 1
 
-    for i in range(len(predecesores)):
-        sin_preced_completos = np.setdiff1d(predecesores[i], realizadas)
-        if sin_preced_completos.size == 0 and not i in realizadas and not i in ejecutandose:
-            posibles.append(i)
+            if pendientes[sucesor] == 0:
+                posibles.append(sucesor)
 
     return posibles
 
 def selecciona_actividad(posibles, I):
     """ Posible te dice los indices (actv) que puedes coger, e I para ordenar
+        En caso de empate en la clave se elige la actividad de menor indice
     """
 
-    I_posibles = np.array(I)[posibles]
+    return max(posibles, key = lambda actv: (I[actv], -actv))
 
-    #Guardamos el indice donde es mayor para las posibles, el indice real lo dara posibles
-    indx_max = np.argmax(I_posibles)
-    return posibles[indx_max]
-
-def es_factible(actividad, modo, recursos_en_uso, recursos_modo, lim_recursos):
+def es_factible(actividad, modo, en_ejecucion, recursos_modo, lim_recursos):
     """ Comprueba si insertando actividad,modo en conjunto solucion da una solucion posible
     """
 
     factible = False
 
     #Si no se esta ejecutando nada, se puede meter porque no existe modos inejecutables, si no, se comprueba si cabe
-    if recursos_en_uso == []:
+    if en_ejecucion["actividades"] == []:
         factible = True
     else:
-        #Se crea matriz con recursos en columna, se suma las filas y se comprueba que ninguno exceda
-        peticion = recursos_en_uso + [recursos_modo[actividad][modo]]
-        suma = np.sum(peticion, axis = 0)
+        #Se suma la peticion al uso total de los recursos y se comprueba que ninguno exceda
+        suma = en_ejecucion["uso_total"] + recursos_modo[actividad, modo]
         factible = not np.any(suma > lim_recursos)
 
 
@@ -101,26 +253,29 @@ def inserta_en_ejecucion(en_ejecucion, actividad, modo, recursos_modo, dias_modo
     """
 
     #Se añade actividad a la lista
-    en_ejecucion["actividades"] = en_ejecucion["actividades"] + [actividad]
+    en_ejecucion["actividades"].append(actividad)
+
+    en_ejecucion["recursos_en_uso"].append(recursos_modo[actividad, modo])
 
-    en_ejecucion["recursos_en_uso"] = en_ejecucion["recursos_en_uso"] + [recursos_modo[actividad][modo]]
+    en_ejecucion["dias_restantes"].append(dias_modo[actividad, modo].item())
 
-    en_ejecucion["dias_restantes"] = en_ejecucion["dias_restantes"] + [dias_modo[actividad][modo]]
+    en_ejecucion["uso_total"] = en_ejecucion["uso_total"] + recursos_modo[actividad, modo]
 
     return en_ejecucion
 
 
-def actualiza_dia(realizadas, en_ejecucion):
-    """Actualiza un dia, o ud. de tiempo, en la estructura de ejecucion
+def actualiza_dia(realizadas, en_ejecucion, dias = 1):
+    """Avanza los dias, o uds. de tiempo, indicados en la estructura de ejecucion
     """
 
     end = len(en_ejecucion["dias_restantes"])
     i = 0
     while i < end:
-        en_ejecucion["dias_restantes"][i] -= 1
+        en_ejecucion["dias_restantes"][i] -= dias
 
         if en_ejecucion["dias_restantes"][i] == 0:
-            realizadas = realizadas + [en_ejecucion["actividades"][i]]
+            realizadas.append(en_ejecucion["actividades"][i])
+            en_ejecucion["uso_total"] = en_ejecucion["uso_total"] - en_ejecucion["recursos_en_uso"][i]
             del en_ejecucion["dias_restantes"][i]
             del en_ejecucion["actividades"][i]
             del en_ejecucion["recursos_en_uso"][i]
@@ -131,61 +286,252 @@ def actualiza_dia(realizadas, en_ejecucion):
 
 
 
-def decodifica(cromosoma, predecesores, lim_recursos, recursos_modo, dias_modo):
+def decodifica(cromosoma, predecesores, lim_recursos, recursos_modo, dias_modo, sucesores = None, n_predecesores = None):
     """Funcion que nos decodifica un cromosoma para obtener el fenotipo
+
+       Esquema de generacion paralelo dirigido por eventos: en lugar de avanzar dia a dia
+       se salta directamente al siguiente dia en el que termina alguna actividad en ejecucion,
+       ya que en los dias intermedios no cambia el conjunto de posibles ni los recursos libres.
+       El coste depende del numero de actividades y no de la duracion de la planificacion.
+
+       Las posibles se mantienen de forma incremental con contadores de predecesores pendientes,
+       sucesores y n_predecesores se calculan a partir de predecesores si no se proporcionan.
+
+       recursos_modo y dias_modo son los arrays rellenos de Problema, si se pasan como listas
+       por actividad-modo se convierten antes de decodificar.
     """
 
+    if sucesores is None or n_predecesores is None:
+        sucesores, n_predecesores = calcula_sucesores(predecesores)
+
+    if not isinstance(recursos_modo, np.ndarray):
+        recursos_modo = rellena_modos(recursos_modo, (len(lim_recursos),))
+    if not isinstance(dias_modo, np.ndarray):
+        dias_modo = rellena_modos(dias_modo)
+
+    lim_recursos = np.asarray(lim_recursos)
+
     #Inicializacion
-    en_ejecucion = {"actividades" : [], "recursos_en_uso" : [] , "dias_restantes" : []}
+    en_ejecucion = {"actividades" : [], "recursos_en_uso" : [] , "dias_restantes" : [], "uso_total" : np.zeros(len(lim_recursos), dtype = recursos_modo.dtype)}
     realizadas = []
     dia_actual = 0
     solucion = [] #Lista de tuplas formato <actividad,dia_comienzo>
 
+    #Predecesores sin terminar de cada actividad, son posibles las que no tienen ninguno
+    pendientes = list(n_predecesores)
+    posibles = [i for i, n in enumerate(pendientes) if n == 0]
+
     #Mientras no se haya terminado todas
     while len(realizadas) < len(cromosoma.I):
-        #Se busca las posibles, luego,  se recorren todas las posibles
-        posibles = busca_posibles(realizadas, en_ejecucion["actividades"], lim_recursos, predecesores)
+        #Se recorren todas las posibles, las que no se puedan iniciar siguen siendo posibles
+        por_revisar = posibles
+        posibles = []
 
-        while not len(posibles) == 0:
-            actividad = selecciona_actividad(posibles, cromosoma.I)
-            posibles.remove(actividad)
+        while not len(por_revisar) == 0:
+            actividad = selecciona_actividad(por_revisar, cromosoma.I)
+            por_revisar.remove(actividad)
 
             #Se elige actv. con mas probabilidad dentro de las posibles
-            if es_factible(actividad, cromosoma.m[actividad], en_ejecucion["recursos_en_uso"], recursos_modo, lim_recursos):
+            if es_factible(actividad, cromosoma.m[actividad], en_ejecucion, recursos_modo, lim_recursos):
                 #Si es factible, se agrega a solucion con el dia de comienzo y se inserta en tabla en_ejecucion
                 solucion.append((actividad, dia_actual))
                 en_ejecucion = inserta_en_ejecucion(en_ejecucion, actividad, cromosoma.m[actividad], recursos_modo, dias_modo)
+            else:
+                posibles.append(actividad)
 
 
-        dia_actual += 1
-        [realizadas, en_ejecucion] = actualiza_dia(realizadas, en_ejecucion)
+        #Saltamos a la finalizacion mas proxima de las actividades en ejecucion
+        salto = min(en_ejecucion["dias_restantes"])
+        dia_actual += salto
+        n_realizadas = len(realizadas)
+        [realizadas, en_ejecucion] = actualiza_dia(realizadas, en_ejecucion, salto)
+
+        #Solo los sucesores de las que acaban de terminar pueden pasar a ser posibles
+        posibles = actualiza_posibles(posibles, realizadas[n_realizadas:], pendientes, sucesores)
 
     return solucion
 
 
+def rellena_modos(por_modo, forma_modo = ()):
+    """ Convierte una lista por actividad-modo, con distinto numero de modos por actividad,
+        en un array relleno con ceros hasta el maximo de modos: (n_actvs, max_modos, *forma_modo)
+    """
+
+    max_modos = max(len(modos) for modos in por_modo)
+    matriz = np.zeros((len(por_modo), max_modos) + tuple(forma_modo), dtype = np.result_type(*[np.asarray(m) for m in por_modo]))
+
+    for actividad, modos in enumerate(por_modo):
+        matriz[actividad, :len(modos)] = modos
+
+    return matriz
+
+
+def decodifica_poblacion(claves, modos, dias_matriz, recursos_matriz, lim_recursos, sucesores, n_predecesores):
+    """Decodifica a la vez todos los cromosomas de una poblacion, con arrays (poblacion x actividad)
+       de claves y modos. Aplica el mismo esquema paralelo dirigido por eventos que decodifica,
+       avanzando todos los individuos a la par, y devuelve el dia de comienzo de cada actividad
+    """
+
+    claves = np.asarray(claves, dtype = float)
+    modos = np.asarray(modos, dtype = np.intp)
+    n_indiv, n_actvs = claves.shape
+    actvs = np.arange(n_actvs)
+    lim_recursos = np.asarray(lim_recursos)
+
+    duracion = dias_matriz[actvs, modos]
+    demanda = recursos_matriz[actvs, modos]
+
+    #Rango de prioridad de cada actividad: 0 para la de mayor clave, en empate la de menor indice
+    orden = np.argsort(-claves, axis = 1, kind = 'stable')
+    rango = np.empty_like(orden)
+    np.put_along_axis(rango, orden, actvs[None, :], axis = 1)
+
+    #Sucesores en formato comprimido para descontar predecesores pendientes de forma vectorizada
+    n_sucesores = np.array([len(suc) for suc in sucesores], dtype = np.intp)
+    inicio_suc = np.concatenate(([0], np.cumsum(n_sucesores)))
+    lista_suc = np.array([s for suc in sucesores for s in suc], dtype = np.intp)
+
+    #Estado de cada individuo
+    comienzo = np.full((n_indiv, n_actvs), -1, dtype = duracion.dtype)
+    fin = np.full((n_indiv, n_actvs), np.inf)
+    iniciadas = np.zeros((n_indiv, n_actvs), dtype = bool)
+    terminadas = np.zeros((n_indiv, n_actvs), dtype = bool)
+    pendientes = np.tile(np.asarray(n_predecesores, dtype = np.intp), (n_indiv, 1))
+    uso = np.zeros((n_indiv, demanda.shape[2]), dtype = demanda.dtype)
+    en_curso = np.zeros(n_indiv, dtype = np.intp)
+    dia_actual = np.zeros(n_indiv, dtype = duracion.dtype)
+
+    while True:
+        #Se recorren las posibles de cada individuo por orden de prioridad, una por individuo cada vez
+        por_revisar = (pendientes == 0) & ~iniciadas
+
+        while por_revisar.any():
+            indiv = np.nonzero(por_revisar.any(axis = 1))[0]
+            actividad = np.where(por_revisar[indiv], rango[indiv], n_actvs).argmin(axis = 1)
+            peticion = demanda[indiv, actividad]
+
+            #Si no se esta ejecutando nada se puede meter, si no, se comprueba si cabe
+            factible = (en_curso[indiv] == 0) | np.all(uso[indiv] + peticion <= lim_recursos, axis = 1)
+            i_ok, a_ok = indiv[factible], actividad[factible]
+
+            comienzo[i_ok, a_ok] = dia_actual[i_ok]
+            fin[i_ok, a_ok] = dia_actual[i_ok] + duracion[i_ok, a_ok]
+            iniciadas[i_ok, a_ok] = True
+            uso[i_ok] += peticion[factible]
+            en_curso[i_ok] += 1
+
+            por_revisar[indiv, actividad] = False
+
+        en_ejecucion = iniciadas & ~terminadas
+        activos = en_ejecucion.any(axis = 1)
+
+        if not activos.any():
+            break
+
+        #Cada individuo salta a la finalizacion mas proxima de sus actividades en ejecucion
+        proximo = np.where(en_ejecucion, fin, np.inf).min(axis = 1)
+        dia_actual[activos] = proximo[activos]
+
+        terminan = en_ejecucion & (fin == dia_actual[:, None])
+        indiv, actividad = np.nonzero(terminan)
+
+        terminadas[indiv, actividad] = True
+        np.subtract.at(uso, indiv, demanda[indiv, actividad])
+        en_curso -= terminan.sum(axis = 1)
+
+        #Solo los sucesores de las que terminan descuentan un predecesor pendiente
+        cuantos = n_sucesores[actividad]
+        desplazamiento = np.arange(cuantos.sum()) - np.repeat(np.cumsum(cuantos) - cuantos, cuantos)
+        sucesor = lista_suc[np.repeat(inicio_suc[actividad], cuantos) + desplazamiento]
+        np.subtract.at(pendientes, (np.repeat(indiv, cuantos), sucesor), 1)
+
+    return comienzo
+
+
+#Copia del problema en cada proceso trabajador, se recibe una unica vez al arrancar el proceso
+_problema_trabajador = None
+
+
+#Version del formato de la cache de problemas compilados, forma parte de la firma
+VERSION_COMPILADO = 1
+
+#Arrays que se guardan en la cache de problemas compilados
+_ARRAYS_COMPILADOS = ("dias_matriz", "recursos_matriz", "coste_matriz", "n_modos", "lim_vector", "ban_valores", "ban_inicios")
+
+
+def firma_instancia(*datos):
+    """ Hash sha256 del contenido de una instancia sin preprocesar, clave de la cache de problemas compilados
+    """
+
+    texto = json.dumps([VERSION_COMPILADO, datos], default = lambda o: np.asarray(o).tolist())
+
+    return hashlib.sha256(texto.encode()).hexdigest()
+
+
+def _inicia_trabajador(problema):
+    """ Inicializador de los procesos trabajadores: guarda la copia del problema
+    """
+    global _problema_trabajador
+    _problema_trabajador = problema
+
+
+def _evalua_bloque(claves, modos):
+    """ Evalua en un proceso trabajador un bloque de la poblacion
+    """
+    return _problema_trabajador.evalua_poblacion(claves, modos)
+
+
 class Problema(inspyred.benchmarks.Benchmark):
-""" Clase que modela nuestro problema MRCPSP
+    """ Clase que modela nuestro problema MRCPSP
+
+        Atributos:
+
+            recursos_modo - gasto de recursos renovables por cada actividad-modo
+
+            dias_modo - tiempo necesario de ejecucion de cada actividad-modo
+
+            lim_recursos - limite de los recursos renovables
+
+            Mn - cantidad de modos disponibles para cada actividad
 
-    Atributos:
+            predecesores - lista de predecesores de cada actividad
 
-        recursos_modo - gasto de recursos renovables por cada actividad-modo
+        Atributos derivados:
 
-        dias_modo - tiempo necesario de ejecucion de cada actividad-modo
+            coste_modo - coste de cada actividad-modo
 
-        lim_recursos - limite de los recursos renovables
+            modos_ban - lista de los modos prohibidos
 
-        Mn - cantidad de modos disponibles para cada actividad
+            sucesores - lista de sucesores de cada actividad
 
-        predecesores - lista de predecesores de cada actividad
+            n_predecesores - numero de predecesores de cada actividad
 
-    Atributos derivados:
+        Representacion compilada (ver compila):
 
-        coste_modo - coste de cada actividad-modo
+            dias_matriz, recursos_matriz, coste_matriz - dias, recursos y coste de cada actividad-modo
+            en arrays rellenos hasta el maximo de modos
 
-        modos_ban - lista de los modos prohibidos
-"""
+            modos_validos - mascara (actividad x modo) de los modos que existen
 
-    def __init__(self, recursos_modo, dias_modo, lim_recursos, Mn, predecesores, coste_fijo, coste_rnr, rnr_modo, objetivos = 2):
+            n_modos - numero de modos validos de cada actividad
+
+            lim_vector - limite de los recursos renovables como array
+
+            Con dir_compilados la representacion compilada se guarda en disco, en un directorio por
+            firma_instancia de los datos de entrada, y se proyecta en memoria en las siguientes cargas
+
+        Cache de fitness:
+
+            tam_cache - numero maximo de firmas guardadas, 0 para no usar cache
+
+            cache, aciertos_cache, fallos_cache - fitness por firma y estadisticas de uso
+
+        Evaluacion en paralelo:
+
+            pool, n_procesos - procesos trabajadores que reparten la evaluacion, None si no se usan
+    """
+
+    def __init__(self, recursos_modo, dias_modo, lim_recursos, Mn, predecesores, coste_fijo, coste_rnr, rnr_modo, objetivos = 2, tam_cache = 10000, dir_compilados = None):
 
         inspyred.benchmarks.Benchmark.__init__(self, len(Mn), objetivos)
 
@@ -195,6 +541,8 @@ class Problema(inspyred.benchmarks.Benchmark):
         self.Mn = Mn
         self.predecesores = predecesores
 
+        #Indice de sucesores y numero de predecesores de cada actividad para el decodificador
+        self.sucesores, self.n_predecesores = calcula_sucesores(predecesores)
 
         #Calculamos el coste de cada modo según su gasto de recursos no renovables y su coste fijo
         coste_modo = np.array([np.array(i, dtype=object)*coste_rnr for i in np.array(rnr_modo, dtype=object)], dtype=object)
@@ -208,7 +556,29 @@ class Problema(inspyred.benchmarks.Benchmark):
         #Modos prohibidos para obtener las planificaciones sin equivocaciones
         self.modos_ban = [[] for _ in range(len(Mn))]
 
-        self.preprocesamiento()
+        #Con dir_compilados el problema preprocesado se guarda en disco y se reutiliza en las siguientes cargas
+        if dir_compilados is None:
+            self.preprocesamiento()
+            self.compila()
+        else:
+            ruta = os.path.join(dir_compilados, firma_instancia(recursos_modo, dias_modo, lim_recursos, predecesores, coste_fijo, coste_rnr, rnr_modo))
+
+            if os.path.isdir(ruta):
+                self.carga_compilado(ruta)
+            else:
+                self.preprocesamiento()
+                self.compila()
+                self.guarda_compilado(ruta)
+
+        #Cache LRU de fitness por firma del cromosoma, tam_cache = 0 la desactiva
+        self.tam_cache = tam_cache
+        self.cache = OrderedDict()
+        self.aciertos_cache = 0
+        self.fallos_cache = 0
+
+        #Pool de procesos para evaluar en paralelo, ver inicia_procesos
+        self.pool = None
+        self.n_procesos = 1
 
         self.maximize = False
 
@@ -252,6 +622,116 @@ class Problema(inspyred.benchmarks.Benchmark):
         return 0
 
 
+    def __getstate__(self):
+        """ Al copiar el problema a otros procesos no se envia el pool ni el contenido de la cache
+        """
+        estado = self.__dict__.copy()
+        estado["pool"] = None
+        estado["n_procesos"] = 1
+        estado["cache"] = OrderedDict()
+
+        return estado
+
+
+    def inicia_procesos(self, n_procesos):
+        """ Arranca n_procesos trabajadores a los que evaluador reparte la poblacion. Cada trabajador
+            recibe los datos del problema una unica vez al arrancar, no con cada bloque
+        """
+        self.cierra_procesos()
+
+        if n_procesos > 1:
+            self.pool = Pool(processes = n_procesos, initializer = _inicia_trabajador, initargs = (self,))
+            self.n_procesos = n_procesos
+
+        return 0
+
+
+    def cierra_procesos(self):
+        """ Termina los procesos trabajadores si los hay
+        """
+        if self.pool is not None:
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
+            self.n_procesos = 1
+
+        return 0
+
+
+    def compila(self):
+        """ Construye una unica vez, tras el preprocesamiento, la representacion del problema en arrays
+            rellenos que usan los decodificadores, los operadores de mutacion y el calculo del coste
+        """
+
+        self.dias_matriz = rellena_modos(self.dias_modo)
+        self.recursos_matriz = rellena_modos(self.recursos_modo, (len(self.lim_recursos),))
+        self.coste_matriz = rellena_modos(self.coste_modo).astype(float)
+
+        self.modos_validos = np.arange(self.dias_matriz.shape[1]) < np.array(self.Mn)[:, None]
+        self.n_modos = self.modos_validos.sum(axis = 1)
+        self.lim_vector = np.array(self.lim_recursos, dtype = self.recursos_matriz.dtype)
+
+        return 0
+
+
+    def guarda_compilado(self, ruta):
+        """ Guarda la representacion compilada en el directorio ruta, un fichero .npy por array.
+            Se escribe en un directorio temporal que se renombra al final, asi otro proceso nunca
+            ve una cache a medias
+        """
+
+        modos_ban = [list(mb) for mb in self.modos_ban]
+        arrays = {
+            "dias_matriz": self.dias_matriz,
+            "recursos_matriz": self.recursos_matriz,
+            "coste_matriz": self.coste_matriz,
+            "n_modos": self.n_modos,
+            "lim_vector": self.lim_vector,
+            "ban_valores": np.array([m for mb in modos_ban for m in mb], dtype = np.intp),
+            "ban_inicios": np.cumsum([0] + [len(mb) for mb in modos_ban])
+        }
+
+        temporal = ruta + ".tmp{}".format(os.getpid())
+        os.makedirs(temporal, exist_ok = True)
+
+        for nombre in _ARRAYS_COMPILADOS:
+            np.save(os.path.join(temporal, nombre + ".npy"), arrays[nombre])
+
+        try:
+            os.replace(temporal, ruta)
+        except OSError:
+            #Otro proceso la ha guardado antes
+            shutil.rmtree(temporal, ignore_errors = True)
+
+        return 0
+
+
+    def carga_compilado(self, ruta):
+        """ Carga la representacion compilada guardada con guarda_compilado. Los arrays se proyectan
+            en memoria de solo lectura y las listas por actividad-modo se reconstruyen a partir de ellos
+        """
+
+        arrays = {nombre: np.load(os.path.join(ruta, nombre + ".npy"), mmap_mode = 'r') for nombre in _ARRAYS_COMPILADOS}
+
+        self.dias_matriz = arrays["dias_matriz"]
+        self.recursos_matriz = arrays["recursos_matriz"]
+        self.coste_matriz = arrays["coste_matriz"]
+        self.n_modos = np.array(arrays["n_modos"])
+        self.lim_vector = arrays["lim_vector"]
+        self.modos_validos = np.arange(self.dias_matriz.shape[1]) < self.n_modos[:, None]
+
+        self.Mn = self.n_modos.tolist()
+        self.lim_recursos = self.lim_vector.tolist()
+        self.dias_modo = [self.dias_matriz[i, :m].tolist() for i, m in enumerate(self.Mn)]
+        self.recursos_modo = [self.recursos_matriz[i, :m].tolist() for i, m in enumerate(self.Mn)]
+        self.coste_modo = [self.coste_matriz[i, :m].tolist() for i, m in enumerate(self.Mn)]
+
+        inicios = arrays["ban_inicios"]
+        self.modos_ban = [arrays["ban_valores"][inicios[i]:inicios[i + 1]].tolist() for i in range(len(self.Mn))]
+
+        return 0
+
+
     def elimina_recursos_redundantes(self):
         """Sean recursos redundantes aquellos para los que ni realizando todas las actividades con su modo mas costoso para
            determinado recurso se vean agotados
@@ -354,7 +834,9 @@ class Problema(inspyred.benchmarks.Benchmark):
                 new_coste_modo[actividad].append(self.coste_modo[actividad])
 
 
-        return cambios, np.squeeze(new_recursos_modo).tolist(), np.squeeze(new_dias_modo).tolist(), np.squeeze(new_coste_modo).tolist()
+        #Cada actividad tiene una unica entrada, se deshace ese nivel sin convertir a array porque
+        #el numero de modos puede ser distinto entre actividades
+        return cambios, [r[0] for r in new_recursos_modo], [d[0] for d in new_dias_modo], [c[0] for c in new_coste_modo]
 
 
     def genera_candidato(self, random, args):
@@ -363,79 +845,193 @@ class Problema(inspyred.benchmarks.Benchmark):
 
         num_acts = len(self.recursos_modo)
         rk_acts = [random.random() for _ in range(num_acts)]
-        rk_modos = [random.randint(0, self.Mn[i]-1) for i in range(num_acts)]
+        rk_modos = [random.randint(0, self.n_modos[i]-1) for i in range(num_acts)]
 
         return Cromosoma(rk_acts, rk_modos)
 
 
-    def mutacion_modos(self, random, candidates, args):
-        """ Operador de mutacion con cambio de modo
+    def genera_poblacion(self, random, n):
+        """ Genera n cromosomas aleatorios como filas de una Poblacion, con los mismos numeros aleatorios
+            que n llamadas a genera_candidato
         """
 
-        prob_mutacion = args.setdefault('mutation_rate', 0.1)
+        num_acts = len(self.recursos_modo)
+        poblacion = Poblacion(np.empty((n, num_acts), dtype = TIPO_CLAVE), np.empty((n, num_acts), dtype = TIPO_MODO))
 
-        #Para cada individuo
-        for it, cromosoma in enumerate(candidates):
+        for k in range(n):
+            poblacion.claves[k] = [random.random() for _ in range(num_acts)]
+            poblacion.modos[k] = [random.randint(0, self.n_modos[i]-1) for i in range(num_acts)]
 
-            #Se elige actividad aleatoria
-            actv_i = random.randint(0, len(cromosoma.I) - 1)
+        return poblacion
+
+
+    def fitness_progenitores(self, poblacion, args):
+        """ Fitness (tiempo, coste) de cada fila de poblacion. Se toma de los individuos de la poblacion actual
+            del algoritmo (args['_ec'].population, de donde salen los progenitores) con la misma firma; los que
+            no esten se evaluan directamente. No depende de la cache de fitness
+        """
+        conocidos = {}
+
+        ec = args.get('_ec')
+        if ec is not None and ec.population:
+            actual = Poblacion.de_cromosomas([indiv.candidate for indiv in ec.population])
+            for firma, indiv in zip(actual.firmas(), ec.population):
+                conocidos[firma] = tuple(indiv.fitness)
+
+        firmas = poblacion.firmas()
+        faltan = [i for i, firma in enumerate(firmas) if firma not in conocidos]
+        if faltan:
+            obj1, obj2 = self.evalua_poblacion(poblacion.claves[faltan], poblacion.modos[faltan])
+            for i, t, c in zip(faltan, obj1, obj2):
+                conocidos[firmas[i]] = (t, c)
+
+        return [conocidos[firma] for firma in firmas]
+
+
+    def cruce_sesgado(self, random, candidates, args):
+        """ Cruce uniforme sesgado al estilo BRKGA de todo el grupo de cruce a la vez: en cada pareja que se cruza
+            los dos hijos toman cada gen del progenitor elite con probabilidad sesgo_elite y del otro en el resto.
+            Es elite el padre si domina a la madre y si no la madre, con el fitness de fitness_progenitores
+        """
+        madres, padres, cruzan, generador = _parejas(random, candidates, args)
+        if len(madres) == 0:
+            return []
+
+        #Una sola consulta por generacion para madres y padres
+        fitness = self.fitness_progenitores(Poblacion(np.vstack((madres.claves, padres.claves)), np.vstack((madres.modos, padres.modos))), args)
+        fit_madres, fit_padres = fitness[:len(madres)], fitness[len(madres):]
+        padre_elite = np.array([all(p <= m for p, m in zip(fp, fm)) and fp != fm
+                                for fm, fp in zip(fit_madres, fit_padres)], dtype = bool)
+
+        elites = Poblacion(np.where(padre_elite[:, None], padres.claves, madres.claves), np.where(padre_elite[:, None], padres.modos, madres.modos))
+        otros = Poblacion(np.where(padre_elite[:, None], madres.claves, padres.claves), np.where(padre_elite[:, None], madres.modos, padres.modos))
+
+        #Las parejas que no se cruzan dan el elite y el otro sin cambios
+        sesgo_elite = args.setdefault('sesgo_elite', 0.7)
+        mascara_1 = (generador.random(elites.claves.shape) < sesgo_elite) | ~cruzan[:, None]
+        mascara_2 = (generador.random(elites.claves.shape) < sesgo_elite) & cruzan[:, None]
+
+        return _hijos(elites, otros, mascara_1, mascara_2)
+
+
+    def mutacion_modos(self, random, candidates, args):
+        """ Operador de mutacion con cambio de modo, para toda la poblacion a la vez: cada individuo elige una
+            actividad y con probabilidad mutation_rate, si tiene mas de un modo, le asigna otro de sus modos.
+            No modifica los candidatos recibidos: los mutados se copian al escribir (ver _sustituye_mutados)
+        """
+
+        prob_mutacion = args.setdefault('mutation_rate', 0.1)
 
-            if random.random() < prob_mutacion and self.Mn[actv_i] > 1:
+        if len(candidates) == 0:
+            return candidates
 
-                #Lista con modos disponibles, excepto el actual, se escoge uno nuevo aleatorio
-                modos_disponibles = list(range(self.Mn[actv_i]))
+        n_indiv, n_acts = len(candidates), len(candidates[0])
 
-                modos_disponibles.remove(cromosoma.m[actv_i])
+        #Todos los numeros aleatorios de una vez: actividad, si muta y el nuevo modo entre los demas validos
+        generador = np.random.default_rng(random.getrandbits(64))
+        actividad = generador.integers(0, n_acts, n_indiv)
+        n_modos = self.n_modos[actividad]
+        muta = (generador.random(n_indiv) < prob_mutacion) & (n_modos > 1)
+        desplazamiento = (generador.random(n_indiv)*(n_modos - 1)).astype(np.intp)
 
-                new_modo = random.choice(modos_disponibles)
-                new_m = cromosoma.m
-                new_m[actv_i] = new_modo
+        filas = np.flatnonzero(muta)
+        if len(filas) == 0:
+            return list(candidates)
 
-                #Se crea el nuevo cromosoma con el nuevo modo
-                new_cromosoma = Cromosoma(cromosoma.I, new_m)
+        mutados = Poblacion.de_cromosomas([candidates[k] for k in filas])
 
-                candidates[it] = new_cromosoma
+        #Los modos validos son 0..n_modos-1, se salta el actual
+        actual = mutados.modos[np.arange(len(filas)), actividad[filas]]
+        nuevo = desplazamiento[filas] + (desplazamiento[filas] >= actual)
+        mutados.modos[np.arange(len(filas)), actividad[filas]] = nuevo
 
-        return candidates
+        return _sustituye_mutados(candidates, filas, mutados)
 
 
     def mutacion_actividades(self, random, candidates, args):
-        """ Operador de mutacion con permutaciones en las actividades
+        """ Operador de mutacion con permutaciones en las actividades, para toda la poblacion a la vez: cada
+            individuo elige dos actividades distintas y con probabilidad mutation_rate intercambia sus claves.
+            No modifica los candidatos recibidos: los mutados se copian al escribir (ver _sustituye_mutados)
         """
 
         prob_mutacion = args.setdefault('mutation_rate', 0.1) #Con esto tenemos que probar!
 
-        #Para cada individuo
-        for it, cromosoma in enumerate(candidates):
+        if len(candidates) == 0:
+            return candidates
 
-            #Se eligen dos actividad aleatoria
-            actv_i = random.randint(0, len(cromosoma.I) - 1)
-            #otra aleatoria
-            actv_j = random.randint(0, len(cromosoma.I) - 1)
+        n_indiv, n_acts = len(candidates), len(candidates[0])
 
-            #que sean distintas
-            while (actv_i == actv_j and len(cromosoma.I)>2):#por precacucion
-                actv_j = random.randint(0, len(cromosoma.I) - 1)
+        #Todos los numeros aleatorios de una vez: las dos actividades, distintas si hay mas de una, y si muta
+        generador = np.random.default_rng(random.getrandbits(64))
+        actv_i = generador.integers(0, n_acts, n_indiv)
+        actv_j = generador.integers(0, max(n_acts - 1, 1), n_indiv)
+        if n_acts > 1:
+            actv_j += actv_j >= actv_i
+        muta = generador.random(n_indiv) < prob_mutacion
 
+        filas = np.flatnonzero(muta)
+        if len(filas) == 0:
+            return list(candidates)
 
-            if random.random() < prob_mutacion:
+        mutados = Poblacion.de_cromosomas([candidates[k] for k in filas])
 
-                i_aux = cromosoma.I[actv_i]
-                cromosoma.I[actv_i] = cromosoma.I[actv_j]
-                cromosoma.I[actv_j] = i_aux
+        indiv = np.arange(len(filas))
+        i, j = actv_i[filas], actv_j[filas]
+        mutados.claves[indiv, i], mutados.claves[indiv, j] = mutados.claves[indiv, j], mutados.claves[indiv, i]
 
-        return candidates
+        return _sustituye_mutados(candidates, filas, mutados)
+
+
+    def mutacion_conjunta(self, random, candidates, args):
+        """ Operador de mutacion conjunta de claves y modos con tasas por gen, para toda la poblacion a la vez:
+            cada clave se cambia por otra aleatoria con probabilidad tasa_claves y cada actividad con mas de un
+            modo pasa a otro de sus modos con probabilidad tasa_modos, de forma independiente. Las tasas son un
+            valor o un array con una por actividad; por defecto mutation_rate/actividades, un cambio de cada
+            tipo por cada 1/mutation_rate individuos como mutacion_actividades y mutacion_modos.
+            Las dos mascaras salen de un unico sorteo por generacion y los mutados se copian al escribir
+        """
+
+        if len(candidates) == 0:
+            return candidates
+
+        n_indiv, n_acts = len(candidates), len(candidates[0])
+
+        prob_mutacion = args.setdefault('mutation_rate', 0.1)
+        tasa_claves = np.asarray(args.setdefault('tasa_claves', prob_mutacion/n_acts))
+        tasa_modos = np.asarray(args.setdefault('tasa_modos', prob_mutacion/n_acts))*(self.n_modos > 1)
+
+        #Un sorteo para las dos mascaras de toda la poblacion
+        generador = np.random.default_rng(random.getrandbits(64))
+        sorteo = generador.random((2, n_indiv, n_acts))
+        muta_clave = sorteo[0] < tasa_claves
+        muta_modo = sorteo[1] < tasa_modos
+
+        filas = np.flatnonzero(muta_clave.any(axis = 1) | muta_modo.any(axis = 1))
+        if len(filas) == 0:
+            return list(candidates)
+
+        mutados = Poblacion.de_cromosomas([candidates[k] for k in filas])
+        muta_clave, muta_modo = muta_clave[filas], muta_modo[filas]
+
+        mutados.claves[muta_clave] = generador.random(np.count_nonzero(muta_clave))
+
+        #Los modos validos son 0..n_modos-1, se salta el actual
+        indiv, actv = np.nonzero(muta_modo)
+        desplazamiento = (generador.random(len(actv))*(self.n_modos[actv] - 1)).astype(np.intp)
+        mutados.modos[indiv, actv] = desplazamiento + (desplazamiento >= mutados.modos[indiv, actv])
+
+        return _sustituye_mutados(candidates, filas, mutados)
 
 
     def makespan(self, cromosoma):
         """Calcula el tiempo necesario para completar una planificación
         """
-        sol = decodifica(cromosoma, self.predecesores, self.lim_recursos, self.recursos_modo, self.dias_modo) #Aki fallo
+        sol = decodifica(cromosoma, self.predecesores, self.lim_vector, self.recursos_matriz, self.dias_matriz, self.sucesores, self.n_predecesores)
 
         dia_finalizacion = []
 
         for i, actv_dia in enumerate(sol):
-            dia_finalizacion.append(actv_dia[1]+self.dias_modo[actv_dia[0]][cromosoma.m[actv_dia[0]]])
+            dia_finalizacion.append(actv_dia[1]+self.dias_matriz[actv_dia[0], cromosoma.m[actv_dia[0]]].item())
 
         makespan = max(dia_finalizacion)
 
@@ -445,38 +1041,103 @@ class Problema(inspyred.benchmarks.Benchmark):
     def calcula_coste(self, cromosoma):
         """Calcula el coste de una planificacion dada
         """
-        coste = 0
-        for actv, modo in enumerate (cromosoma.m):
-            coste += self.coste_modo[actv][modo]
-        return coste
+        return self.coste_poblacion(np.array([cromosoma.m], dtype = np.intp))[0].item()
 
 
-    def evaluador(self, candidates, args):
-        """Funcion de evaluacion multiobjetivo
+    def makespan_poblacion(self, claves, modos):
+        """Calcula el tiempo necesario para completar la planificacion de cada individuo de una poblacion,
+           dada por arrays (poblacion x actividad) de claves y modos
         """
-        fitness = []
-        for cromosoma in candidates:
+        comienzo = decodifica_poblacion(claves, modos, self.dias_matriz, self.recursos_matriz, self.lim_vector, self.sucesores, self.n_predecesores)
 
-            obj1 = self.makespan(cromosoma)
+        dia_finalizacion = comienzo + self.dias_matriz[np.arange(comienzo.shape[1]), modos]
 
-            obj2 = self.calcula_coste(cromosoma)
+        return dia_finalizacion.max(axis = 1)
 
-            fitness.append(inspyred.ec.emo.Pareto([obj1, obj2]))
 
-        return fitness
+    def coste_poblacion(self, modos):
+        """Calcula el coste de la planificacion de cada individuo de una poblacion dado su array de modos
+        """
+        #Suma acumulada para sumar las actividades en orden, como se hacia sumando una a una
+        return np.cumsum(self.coste_matriz[np.arange(modos.shape[1]), modos], axis = 1)[:, -1]
 
 
+    def evalua_poblacion(self, claves, modos):
+        """Calcula los dos objetivos, makespan y coste, de una poblacion dada por sus arrays de claves y modos
+           Si hay procesos trabajadores se reparte la poblacion en un bloque por proceso
+        """
+        if self.pool is not None and len(claves) > 1:
+            bloques = np.array_split(np.arange(len(claves)), min(self.n_procesos, len(claves)))
+            resultados = self.pool.starmap(_evalua_bloque, [(claves[b], modos[b]) for b in bloques])
 
+            return [t for r in resultados for t in r[0]], [c for r in resultados for c in r[1]]
 
-def resuelve(Mn, lim_recursos, recursos_modo, coste_rnr, rnr_modo, coste_fijo, tiempo_modo, predecesores, n_experimentos, pdefecto):
-    """Función útil para poner en marcha los algoritmos pertinente en función del modo escogido.
-       Devuelve el conjunto Pareto solucion al problema.
-    """
+        return self.makespan_poblacion(claves, modos).tolist(), self.coste_poblacion(modos).tolist()
 
-    problem = Problema(recursos_modo, tiempo_modo, lim_recursos, Mn, predecesores, coste_fijo, coste_rnr, rnr_modo, objetivos = 2)
 
+    def estadisticas_cache(self, desde = None):
+        """Devuelve los aciertos, fallos, tasa de aciertos y tamaño actual de la cache de fitness.
+           Con desde (unas estadisticas anteriores) solo se cuentan las consultas posteriores
+        """
+        aciertos = self.aciertos_cache - (desde["aciertos"] if desde is not None else 0)
+        fallos = self.fallos_cache - (desde["fallos"] if desde is not None else 0)
+
+        return {"aciertos" : aciertos,
+                "fallos" : fallos,
+                "tasa_aciertos" : aciertos / (aciertos + fallos) if aciertos + fallos else 0.0,
+                "tamaño" : len(self.cache)}
+
+
+    def evaluador(self, candidates, args):
+        """Funcion de evaluacion multiobjetivo, decodifica toda la poblacion a la vez
+           Los cromosomas cuya firma este en la cache no se vuelven a decodificar
+        """
+        if len(candidates) == 0:
+            return []
+
+        poblacion = Poblacion.de_cromosomas(candidates)
+        claves, modos = poblacion.claves, poblacion.modos
+
+        if self.tam_cache <= 0:
+            obj1, obj2 = self.evalua_poblacion(claves, modos)
+            return [inspyred.ec.emo.Pareto([t, c]) for t, c in zip(obj1, obj2)]
+
+        firmas = poblacion.firmas()
+
+        #Se buscan las firmas en la cache, las que no esten (sin repetir) se evaluan juntas
+        valores = {}
+        nuevas = []
+        for i, firma in enumerate(firmas):
+            if firma in valores:
+                continue
+            if firma in self.cache:
+                self.cache.move_to_end(firma)
+                valores[firma] = self.cache[firma]
+            else:
+                valores[firma] = None
+                nuevas.append(i)
+
+        self.fallos_cache += len(nuevas)
+        self.aciertos_cache += len(firmas) - len(nuevas)
+
+        if nuevas:
+            obj1, obj2 = self.evalua_poblacion(claves[nuevas], modos[nuevas])
+
+            for i, t, c in zip(nuevas, obj1, obj2):
+                valores[firmas[i]] = (t, c)
+                self.cache[firmas[i]] = (t, c)
 
-    """Estructura con algoritmos del 1 al 20
+            #Se descartan las menos usadas recientemente
+            while len(self.cache) > self.tam_cache:
+                self.cache.popitem(last = False)
+
+        return [inspyred.ec.emo.Pareto(list(valores[firma])) for firma in firmas]
+
+
+
+
+def tabla_algoritmos(problem):
+    """Estructura con algoritmos del 1 al 50
     # 0.- Op. de seleccion
     # 1.- Op. de cruce
     # 2.- Op. de mutacion
@@ -486,7 +1147,7 @@ def resuelve(Mn, lim_recursos, recursos_modo, coste_rnr, rnr_modo, coste_fijo, t
     # 6.- num. crossover point"""
     algoritmos = [
         [inspyred.ec.selectors.tournament_selection,
-        inspyred.ec.variators.uniform_crossover,
+        cruce_uniforme,
         problem.mutacion_actividades,
         0.1,
         inspyred.ec.replacers.crowding_replacement,
@@ -494,7 +1155,7 @@ def resuelve(Mn, lim_recursos, recursos_modo, coste_rnr, rnr_modo, coste_fijo, t
         0],
 
         [inspyred.ec.selectors.tournament_selection,
-        inspyred.ec.variators.uniform_crossover,
+        cruce_uniforme,
         problem.mutacion_actividades,
         0.2,
         inspyred.ec.replacers.crowding_replacement,
@@ -502,7 +1163,7 @@ def resuelve(Mn, lim_recursos, recursos_modo, coste_rnr, rnr_modo, coste_fijo, t
         0],
 
         [inspyred.ec.selectors.rank_selection,
-        inspyred.ec.variators.uniform_crossover,
+        cruce_uniforme,
         problem.mutacion_actividades,
         0.1,
         inspyred.ec.replacers.crowding_replacement,
@@ -510,7 +1171,7 @@ def resuelve(Mn, lim_recursos, recursos_modo, coste_rnr, rnr_modo, coste_fijo, t
         0],
 
         [inspyred.ec.selectors.tournament_selection,
-        inspyred.ec.variators.uniform_crossover,
+        cruce_uniforme,
         problem.mutacion_actividades,
         0.1,
         inspyred.ec.replacers.nsga_replacement,
@@ -518,7 +1179,7 @@ def resuelve(Mn, lim_recursos, recursos_modo, coste_rnr, rnr_modo, coste_fijo, t
         0],
 
         [inspyred.ec.selectors.rank_selection,
-        inspyred.ec.variators.uniform_crossover,
+        cruce_uniforme,
         problem.mutacion_actividades,
         0.1,
         inspyred.ec.replacers.nsga_replacement,
@@ -566,7 +1227,7 @@ def resuelve(Mn, lim_recursos, recursos_modo, coste_rnr, rnr_modo, coste_fijo, t
         1],
 
         [inspyred.ec.selectors.tournament_selection,
-        inspyred.ec.variators.uniform_crossover,
+        cruce_uniforme,
         problem.mutacion_modos,
         0.1,
         inspyred.ec.replacers.crowding_replacement,
@@ -574,7 +1235,7 @@ def resuelve(Mn, lim_recursos, recursos_modo, coste_rnr, rnr_modo, coste_fijo, t
         0],
 
         [inspyred.ec.selectors.tournament_selection,
-        inspyred.ec.variators.uniform_crossover,
+        cruce_uniforme,
         problem.mutacion_modos,
         0.2,
         inspyred.ec.replacers.crowding_replacement,
@@ -582,7 +1243,7 @@ def resuelve(Mn, lim_recursos, recursos_modo, coste_rnr, rnr_modo, coste_fijo, t
         0],
 
         [inspyred.ec.selectors.rank_selection,
-        inspyred.ec.variators.uniform_crossover,
+        cruce_uniforme,
         problem.mutacion_modos,
         0.1,
         inspyred.ec.replacers.crowding_replacement,
@@ -590,7 +1251,7 @@ def resuelve(Mn, lim_recursos, recursos_modo, coste_rnr, rnr_modo, coste_fijo, t
         0],
 
         [inspyred.ec.selectors.tournament_selection,
-        inspyred.ec.variators.uniform_crossover,
+        cruce_uniforme,
         problem.mutacion_modos,
         0.1,
         inspyred.ec.replacers.nsga_replacement,
@@ -598,7 +1259,7 @@ def resuelve(Mn, lim_recursos, recursos_modo, coste_rnr, rnr_modo, coste_fijo, t
         0],
 
         [inspyred.ec.selectors.rank_selection,
-        inspyred.ec.variators.uniform_crossover,
+        cruce_uniforme,
         problem.mutacion_modos,
         0.1,
         inspyred.ec.replacers.nsga_replacement,
@@ -646,74 +1307,387 @@ def resuelve(Mn, lim_recursos, recursos_modo, coste_rnr, rnr_modo, coste_fijo, t
         1]
     ]
 
+    #Algoritmos 21 a 30: los 10 primeros con la mutacion conjunta de claves y modos
+    conjunta = [alg[:2] + [problem.mutacion_conjunta] + alg[3:] for alg in algoritmos[:10]]
+
+    #Algoritmos 31 a 40: los de cruce en n puntos (6 a 10 y 16 a 20) con cruce_n_puntos, que intercambia
+    #segmentos enteros en lugar de solo los genes de los puntos de corte
+    nativos = [alg[:1] + [cruce_n_puntos] + alg[2:] for alg in algoritmos[5:10] + algoritmos[15:20]]
+
+    #Algoritmos 41 a 50: los de cruce uniforme (1 a 5 y 11 a 15) con el cruce sesgado hacia el progenitor elite
+    sesgados = [alg[:1] + [problem.cruce_sesgado] + alg[2:] for alg in algoritmos[0:5] + algoritmos[10:15]]
+
+    return algoritmos + conjunta + nativos + sesgados
+
+
+def modos_reales(modos, modos_ban):
+    """ Traduce los modos de un cromosoma, que se refieren a los modos que quedan tras el preprocesamiento,
+        a los modos de los datos originales saltando los modos prohibidos de cada actividad
+    """
+    nuevos_modos = [int(modo) for modo in modos]
+
+    for i in range(len(nuevos_modos)):
+        for mb in modos_ban[i]:
+            if nuevos_modos[i] >= mb:
+                nuevos_modos[i] += 1
+
+    return nuevos_modos
+
+
+def semilla_corrida(semilla, alg, experimento):
+    """ Semilla determinista de una corrida a partir de la semilla general, el algoritmo y el experimento
+    """
+    return int(np.random.SeedSequence([semilla, alg, experimento]).generate_state(1)[0])
+
+
+#Tamaño de la poblacion y numero de generaciones de cada corrida
+TAM_POBLACION = 100
+MAX_GENERACIONES = 100
+
+
+def descendientes_generacion(num_selected):
+    """ Descendientes que se evaluan en cada generacion: los cruces emparejan los num_selected progenitores
+        y descartan el ultimo si son impares
+    """
+    return num_selected - num_selected % 2
+
+
+def evaluaciones_maximas(problem, alg):
+    """ Evaluaciones de una corrida completa del algoritmo alg: la poblacion inicial y los descendientes
+        de cada generacion
+    """
+    return TAM_POBLACION + MAX_GENERACIONES*descendientes_generacion(tabla_algoritmos(problem)[alg][5])
+
+
+def presupuesto_termination(population, num_generations, num_evaluations, args):
+    """ Terminador del modo con presupuesto: para la corrida al llegar a la hora args['fin_presupuesto']
+        (segun time.time) o antes de la generacion que pasaria de args['evaluaciones_corrida'] evaluaciones
+        (ver descendientes_generacion). Sin ellos no para nunca
+    """
+    fin_presupuesto = args.get('fin_presupuesto')
+    evaluaciones_corrida = args.get('evaluaciones_corrida')
+
+    return ((fin_presupuesto is not None and time.time() >= fin_presupuesto) or
+            (evaluaciones_corrida is not None and num_evaluations + descendientes_generacion(args.get('num_selected', len(population))) > evaluaciones_corrida))
+
+
+def estancamiento_termination(population, num_generations, num_evaluations, args):
+    """ Terminador por estancamiento: para la corrida cuando el hipervolumen de la poblacion ha mejorado
+        menos de un umbral_estancamiento relativo en las ultimas ventana_estancamiento generaciones.
+        El punto de referencia es el peor valor de cada objetivo en la poblacion inicial, ligeramente
+        desplazado como en experimentacion.py. Sin ventana_estancamiento no para nunca
+    """
+    ventana = args.get('ventana_estancamiento')
+    if ventana is None:
+        return False
+
+    puntos = np.array([ind.fitness for ind in population], dtype = float)
+
+    if '_historial_hv' not in args:
+        args['_referencia_hv'] = puntos.max(axis = 0)*(1+1/(1000-1))
+        args['_historial_hv'] = []
+
+    historial = args['_historial_hv']
+    historial.append(hipervolumen(puntos, args['_referencia_hv']))
+
+    if len(historial) <= ventana:
+        return False
+
+    return historial[-1] - historial[-1-ventana] <= args.get('umbral_estancamiento', 1e-3)*historial[-1-ventana]
+
+
+def ejecuta_corrida(problem, alg, semilla, fin_presupuesto = None, evaluaciones_corrida = None, ventana_estancamiento = None, umbral_estancamiento = 1e-3):
+    """ Ejecuta una corrida independiente del algoritmo alg (indice en tabla_algoritmos) con su propio
+        generador aleatorio y devuelve la poblacion final y el numero de generaciones y de evaluaciones.
+        La corrida termina antes de MAX_GENERACIONES si se alcanza fin_presupuesto o evaluaciones_corrida,
+        o si con ventana_estancamiento el hipervolumen deja de mejorar (ver estancamiento_termination)
+    """
+    algoritmos = tabla_algoritmos(problem)
+
+    aleatorio = Random(semilla)
+    ag = inspyred.ec.emo.NSGA2(aleatorio)
+    ag.terminator = [inspyred.ec.terminators.generation_termination, presupuesto_termination, estancamiento_termination]
+    ag.selector = algoritmos[alg][0]
+    ag.variator = [algoritmos[alg][1], algoritmos[alg][2]]
+    ag.replacement = algoritmos[alg][4]
+
+    #La poblacion inicial se genera de una vez en una Poblacion y cada individuo recibe una copia de su fila
+    final_pop = ag.evolve(generator = problem.genera_candidato,
+                                seeds = problem.genera_poblacion(aleatorio, TAM_POBLACION).cromosomas(),
+                                evaluator = problem.evaluador,
+                                pop_size = TAM_POBLACION,
+                                maximize = False,
+                                num_selected = algoritmos[alg][5],
+                                mutation_rate = algoritmos[alg][3],
+                                max_evaluations = 100,
+                                num_crossover_points = algoritmos[alg][6],
+                                max_generations = MAX_GENERACIONES,
+                                fin_presupuesto = fin_presupuesto,
+                                evaluaciones_corrida = evaluaciones_corrida,
+                                ventana_estancamiento = ventana_estancamiento,
+                                umbral_estancamiento = umbral_estancamiento
+                                )
+
+    return final_pop, ag.num_generations, ag.num_evaluations
+
+
+def _corrida_trabajador(corrida):
+    """ Ejecuta en un proceso trabajador una corrida (alg, experimento, semilla, fin_presupuesto, evaluaciones_corrida,
+        ventana_estancamiento, umbral_estancamiento). Devuelve tambien el uso de la cache de fitness en la corrida
+    """
+    alg, experimento, semilla = corrida[:3]
+
+    antes = _problema_trabajador.estadisticas_cache()
+    final_pop, generaciones, evaluaciones = ejecuta_corrida(_problema_trabajador, alg, semilla, *corrida[3:])
+
+    return alg, experimento, final_pop, generaciones, evaluaciones, _problema_trabajador.estadisticas_cache(antes)
+
+
+def genera_corridas(algs, n_experimentos, semilla, con_presupuesto = False):
+    """ Genera las corridas (alg, experimento, semilla) de cada algoritmo. Con presupuesto no se detiene
+        tras n_experimentos: sigue por rondas de n_experimentos nuevos experimentos de cada algoritmo
+    """
+    for ronda in (count() if con_presupuesto else range(1)):
+        for alg in algs:
+            for i in range(ronda*n_experimentos, (ronda+1)*n_experimentos):
+                yield alg, i, semilla_corrida(semilla, alg, i)
+
+
+def experimentos_carrera(n_algs, n_experimentos, eta = 2):
+    """ Rondas de la carrera como pares (algoritmos que siguen, experimentos acumulados de cada uno). Siguen
+        ceil(n_algs/eta**r) en la ronda r hasta quedar uno, que llega a n_experimentos. Los experimentos crecen
+        geometricamente y al menos uno por ronda; si no hay experimentos para tantas rondas, la ultima pasa
+        directamente a un solo algoritmo
+    """
+    rondas = 0
+    while np.ceil(n_algs/eta**rondas) > 1:
+        rondas += 1
+    rondas = min(rondas, n_experimentos - 1)
+
+    experimentos = [n_experimentos]
+    for r in range(rondas - 1, -1, -1):
+        experimentos.insert(0, min(max(r + 1, int(round(n_experimentos*eta**(r - rondas)))), experimentos[0] - 1))
+
+    supervivientes = [int(np.ceil(n_algs/eta**r)) for r in range(rondas)] + [1 if rondas > 0 else n_algs]
+
+    return list(zip(supervivientes, experimentos))
+
+
+def ordena_carrera(algs, frentes_alg):
+    """ Ordena los algoritmos de mejor a peor por su contribucion exclusiva al hipervolumen del frente conjunto
+        de sus poblaciones finales (frentes_alg[alg]) y, a igualdad, por el hipervolumen de su propio frente.
+        La referencia es el peor punto del frente conjunto, desplazado como en experimentacion.py
+    """
+    frentes = [np.asarray(frentes_alg[alg], dtype = float).reshape(-1, 2) for alg in algs]
+    puntos = np.vstack(frentes)
+    if len(puntos) == 0:
+        return list(algs)
+
+    referencia = puntos.max(axis = 0)*(1+1/(1000-1))
+    contribuciones = contribuciones_hipervolumen(frentes, referencia)
+    propios = [hipervolumen(frente, referencia) for frente in frentes]
+
+    orden = sorted(range(len(algs)), key = lambda k: (contribuciones[k], propios[k]), reverse = True)
+    for k in orden:
+        print("Algoritmo ", algs[k]+1, " contribucion ", contribuciones[k], " hipervolumen ", propios[k])
+
+    return [algs[k] for k in orden]
+
+
+#Opciones de resuelve con sus valores por defecto, ver opciones_resuelve
+OPCIONES_RESUELVE = {
+    #Corridas: procesos para evaluar cada generacion o para repartir las corridas (con procesos_corridas > 1
+    #se ignora n_procesos), semilla de la que se deriva la de cada corrida, directorio donde se guarda y
+    #reutiliza el problema preprocesado, indices en tabla_algoritmos a ejecutar en lugar de los de pdefecto
+    #y cambio de cada algoritmo por su version con mutacion_conjunta (21 a 30)
+    "n_procesos": 1,
+    "procesos_corridas": 1,
+    "semilla": None,
+    "dir_compilados": None,
+    "algoritmos": None,
+    "mutacion_conjunta": False,
+    #Presupuesto: con tiempo_max (segundos) o evaluaciones_max se repiten rondas de corridas hasta agotarlo,
+    #y con ventana_estancamiento cada corrida para si su hipervolumen mejora menos de umbral_estancamiento
+    #(relativo) en ese numero de generaciones
+    "tiempo_max": None,
+    "evaluaciones_max": None,
+    "ventana_estancamiento": None,
+    "umbral_estancamiento": 1e-3,
+    #Archivo: las poblaciones finales se guardan en un ArchivoPareto acotado a tam_archivo soluciones
+    "tam_archivo": None,
+    "criterio_archivo": 'crowding',
+    #Carrera: halving sucesivo entre algoritmos, ver experimentos_carrera y ordena_carrera
+    "carrera": False,
+    "eta_carrera": 2
+}
+
+
+def opciones_resuelve(opciones = None):
+    """Completa opciones con los valores de OPCIONES_RESUELVE. Una opcion desconocida es un error
+    """
+    opciones = dict(opciones or {})
+    desconocidas = sorted(set(opciones) - set(OPCIONES_RESUELVE))
+    if desconocidas:
+        raise ValueError("Opciones de resuelve desconocidas: " + ", ".join(desconocidas))
+
+    return dict(OPCIONES_RESUELVE, **opciones)
+
+
+def resuelve(Mn, lim_recursos, recursos_modo, coste_rnr, rnr_modo, coste_fijo, tiempo_modo, predecesores, n_experimentos, pdefecto, opciones = None, archivo = None):
+    """Función útil para poner en marcha los algoritmos pertinente en función del modo escogido.
+       Devuelve el conjunto Pareto solucion al problema.
+       opciones es un diccionario con las de OPCIONES_RESUELVE que cambian. Si se pasa archivo (un ArchivoPareto)
+       se usa ese, y desde otro hilo se puede consultar el conjunto Pareto actual mientras se resuelve.
+    """
+    opciones = opciones_resuelve(opciones)
+
+    problem = Problema(recursos_modo, tiempo_modo, lim_recursos, Mn, predecesores, coste_fijo, coste_rnr, rnr_modo, objetivos = 2, dir_compilados = opciones["dir_compilados"])
+
     try:
-        soluciones = []
+        #Los trabajadores de las corridas no pueden usar un pool del proceso principal (con fork heredan una copia
+        #que no responde) ni crear el suyo, asi que con corridas en paralelo cada corrida evalua en su proceso
+        if opciones["procesos_corridas"] > 1 and opciones["n_procesos"] > 1:
+            print("Con procesos_corridas > 1 se ignora n_procesos = ", opciones["n_procesos"])
+            opciones["n_procesos"] = 1
+
+        problem.inicia_procesos(opciones["n_procesos"])
 
         #Ejecucion por defecto: algoritmos 11, 12, 13, 19, 2 y 3
-        if pdefecto:
+        if opciones["algoritmos"] is not None:
+            algs_pdf = list(opciones["algoritmos"])
+        elif pdefecto:
             algs_pdf = [1,2,10,11,12,18]
+        else:
+            algs_pdf = list(range(20))
 
-            for _, alg in enumerate(algs_pdf):
+        if opciones["mutacion_conjunta"]:
+            algs_pdf = list(dict.fromkeys(20 + alg % 10 if alg < 20 else alg for alg in algs_pdf))
 
-                for i in range(int(n_experimentos)):
+        if opciones["semilla"] is None:
+            opciones["semilla"] = rand.randrange(2**32)
+        print("Semilla : ", opciones["semilla"])
 
-                    print("Algoritmo : ", alg+1)
-                    print("Experimento : ", i)
-                    ag = inspyred.ec.emo.NSGA2(rand)
-                    ag.terminator = inspyred.ec.terminators.generation_termination
-                    ag.selector = algoritmos[alg][0]
-                    ag.variator = [algoritmos[alg][1], algoritmos[alg][2]]
-                    ag.replacement = algoritmos[alg][4]
-
-                    final_pop = ag.evolve(generator = problem.genera_candidato,
-                                                evaluator = problem.evaluador,
-                                                pop_size = 100,
-                                                maximize = False,
-                                                num_selected = algoritmos[alg][5],
-                                                mutation_rate = algoritmos[alg][3],
-                                                max_evaluations = 100,
-                                                num_crossover_points = algoritmos[alg][6],
-                                                max_generations = 100
-                                                )
-
-                    soluciones = soluciones + final_pop
-                    print("Experimento ",i," concluido")
+        con_presupuesto = opciones["tiempo_max"] is not None or opciones["evaluaciones_max"] is not None
+        fin_presupuesto = time.time() + opciones["tiempo_max"] if opciones["tiempo_max"] is not None else None
+        evaluaciones_restantes = opciones["evaluaciones_max"]
 
-        else:
+        if archivo is None:
+            archivo = ArchivoPareto(opciones["tam_archivo"], opciones["criterio_archivo"])
+
+        #No se empieza una corrida si el presupuesto no llega para evaluar su poblacion inicial, asi ninguna se pasa
+        def agotado():
+            return ((fin_presupuesto is not None and time.time() >= fin_presupuesto) or
+                    (evaluaciones_restantes is not None and evaluaciones_restantes < TAM_POBLACION))
+
+        #Puntos de las poblaciones finales de cada algoritmo, para puntuar la carrera
+        frentes_alg = {alg: [] for alg in algs_pdf}
+
+        def inserta(alg, final_pop):
+            archivo.inserta(final_pop)
+            if opciones["carrera"]:
+                frentes_alg[alg].extend(indiv.fitness for indiv in final_pop)
+
+        #Los trabajadores reciben el problema una vez y se reutilizan en todas las rondas
+        pool = None
+        if opciones["procesos_corridas"] > 1:
+            pool = Pool(processes = opciones["procesos_corridas"], initializer = _inicia_trabajador, initargs = (problem,))
 
-            for alg in range(20):
+        def lanza(corridas):
+            """Ejecuta las corridas (alg, experimento, semilla) hasta acabarlas o agotar el presupuesto"""
+            nonlocal evaluaciones_restantes
 
-                for i in range(int(n_experimentos)):
+            if pool is None:
+                for alg, i, semilla_i in corridas:
+                    if agotado():
+                        break
 
                     print("Algoritmo : ", alg+1)
                     print("Experimento : ", i)
-                    ag = inspyred.ec.emo.NSGA2(rand)
-                    ag.terminator = inspyred.ec.terminators.generation_termination
-                    ag.selector = algoritmos[alg][0]
-                    ag.variator = [algoritmos[alg][1], algoritmos[alg][2]]
-                    ag.replacement = algoritmos[alg][4]
 
-                    final_pop = ag.evolve(generator = problem.genera_candidato,
-                                                evaluator = problem.evaluador,
-                                                pop_size = 100,
-                                                maximize = False,
-                                                num_selected = algoritmos[alg][5],
-                                                mutation_rate = algoritmos[alg][3],
-                                                max_evaluations = 100,
-                                                num_crossover_points = algoritmos[alg][6],
-                                                max_generations = 100
-                                                )
+                    antes = problem.estadisticas_cache()
+                    final_pop, generaciones, evaluaciones = ejecuta_corrida(problem, alg, semilla_i, fin_presupuesto, evaluaciones_restantes,
+                                                                            opciones["ventana_estancamiento"], opciones["umbral_estancamiento"])
+
+                    inserta(alg, final_pop)
+                    if evaluaciones_restantes is not None:
+                        evaluaciones_restantes -= evaluaciones
+                    print("Experimento ",i," concluido en la generacion ", generaciones, " aciertos de cache ", problem.estadisticas_cache(antes)["tasa_aciertos"])
+
+                return
+
+            #Las poblaciones finales se incorporan al conjunto Pareto segun van terminando. Se mantienen
+            #pocas corridas en cola para poder dejar de lanzarlas cuando se agota el presupuesto, y cada
+            #una reserva del presupuesto de evaluaciones su cota y devuelve al terminar lo que no ha usado
+            en_curso = deque()
+
+            def recoge():
+                nonlocal evaluaciones_restantes
+
+                cupo, resultado = en_curso.popleft()
+                alg_t, i_t, final_pop, generaciones, evaluaciones, cache = resultado.get()
+                inserta(alg_t, final_pop)
+                if cupo is not None:
+                    evaluaciones_restantes += cupo - evaluaciones
 
-                    soluciones = soluciones + final_pop
-                    print("Experimento ",i," concluido")
+                #Las consultas a la cache de los trabajadores se suman a las del problema
+                problem.aciertos_cache += cache["aciertos"]
+                problem.fallos_cache += cache["fallos"]
+                print("Algoritmo ", alg_t+1, " experimento ", i_t, " concluido en la generacion ", generaciones, " aciertos de cache ", cache["tasa_aciertos"])
 
+            for alg, i, semilla_i in corridas:
+                if agotado():
+                    break
 
+                cupo = None
+                if evaluaciones_restantes is not None:
+                    cupo = min(evaluaciones_restantes, evaluaciones_maximas(problem, alg))
+                    evaluaciones_restantes -= cupo
 
-        pareto_set = devuelve_pareto(soluciones)
+                en_curso.append((cupo, pool.apply_async(_corrida_trabajador, ((alg, i, semilla_i, fin_presupuesto, cupo, opciones["ventana_estancamiento"], opciones["umbral_estancamiento"]),))))
+
+                while len(en_curso) >= 2*opciones["procesos_corridas"] or (en_curso and en_curso[0][1].ready()):
+                    recoge()
+
+                #Con las cotas reservadas puede no quedar presupuesto libre aunque falten corridas por acabar
+                while en_curso and agotado():
+                    recoge()
+
+            while en_curso:
+                recoge()
+
+        try:
+            if opciones["carrera"]:
+                #Halving sucesivo: en cada ronda los supervivientes completan sus experimentos acumulados
+                #y solo pasan a la siguiente los mejores segun su contribucion al hipervolumen del frente conjunto
+                supervivientes = list(algs_pdf)
+                hechos = 0
+                for ronda, (n_supervivientes, experimentos) in enumerate(experimentos_carrera(len(algs_pdf), int(n_experimentos), opciones["eta_carrera"])):
+                    supervivientes = supervivientes[:n_supervivientes]
+                    print("Carrera ronda ", ronda, " algoritmos ", [alg+1 for alg in supervivientes], " experimentos ", experimentos)
+
+                    lanza((alg, i, semilla_corrida(opciones["semilla"], alg, i)) for alg in supervivientes for i in range(hechos, experimentos))
+                    hechos = experimentos
+
+                    if agotado() or len(supervivientes) == 1:
+                        break
+                    supervivientes = ordena_carrera(supervivientes, frentes_alg)
+            else:
+                lanza(genera_corridas(algs_pdf, int(n_experimentos), opciones["semilla"], con_presupuesto))
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+
+        print("Cache de fitness: ", problem.estadisticas_cache())
+
+        pareto_set = archivo.soluciones
 
     except Exception as e:
         exc_type, exc_obj, exc_tb = sys.exc_info()
         fname = os.path.split(exc_tb.tb_frame.f_code.co_filename)[1]
         print(exc_type, fname, exc_tb.tb_lineno)
 
+    finally:
+        problem.cierra_procesos()
+
     return pareto_set, problem.modos_ban
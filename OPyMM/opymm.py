@@ -459,8 +459,8 @@ def cuarta_pantalla():
     """
     cuarto_layout =[
         [sg.Text('Creador de planificaciones óptimas', size=(30, 1), justification='center', font=("Helvetica", 25), relief=sg.RELIEF_RIDGE)],
-        [sg.Text('Elegir el algoritmo por defecto llevará un tiempo mucho menor \nElegir todos los algoritmos llevará un tiempo considerable pero se asegura encontrar todas las planificaciones óptimas')],
-        [sg.Radio('Algoritmo genético por defecto', "ELECCIONAG", key = '-PORDEFECTO-', default=True), sg.Radio('Probar todos los algoritmos genéticos', "ELECCIONAG", key = '-TOTAL-')],
+        [sg.Text('Elegir el algoritmo por defecto llevará un tiempo mucho menor \nElegir todos los algoritmos llevará un tiempo considerable pero se asegura encontrar todas las planificaciones óptimas \nLa carrera prueba todos los algoritmos y va dejando solo los que más aportan, en una fracción de ese tiempo')],
+        [sg.Radio('Algoritmo genético por defecto', "ELECCIONAG", key = '-PORDEFECTO-', default=True), sg.Radio('Probar todos los algoritmos genéticos', "ELECCIONAG", key = '-TOTAL-'), sg.Radio('Carrera entre todos los algoritmos', "ELECCIONAG", key = '-CARRERA-')],
         [sg.Text('Ajuste el número de experimentos (por defecto 10), cuanto mayor sea este número mejores resultados se garantiza a costa de un mayor tiempo de ejecución.')],
         [sg.Slider(range = (1, 100), default_value = 10, orientation = 'h', key= '-NEXP-')],
         [sg.Button('Ejecutar'), sg.Button('Salir')]
@@ -480,19 +480,19 @@ def cuarta_pantalla():
 
 
             window.Close()
-            return values['-PORDEFECTO-'], values['-NEXP-']
+            return values['-PORDEFECTO-'], values['-NEXP-'], values['-CARRERA-']
 
 
     window.Close()
 
 
-def ejecutar_algoritmo(Mn, lim_recursos, recursos_modo, coste_rnr, rnr_modo, coste_fijo, tiempo_modo, predecesores, n_experimentos, pdefecto, queue):
+def ejecutar_algoritmo(Mn, lim_recursos, recursos_modo, coste_rnr, rnr_modo, coste_fijo, tiempo_modo, predecesores, n_experimentos, pdefecto, queue, carrera = False):
     """Funcion util para ejecutar los algoritmos en un thread y comunicar cuando han terminado su ejecucion para parar la animacion y proceder
     """
 
     #--------Ejecutamos el algoritmo
     try:
-        pareto_set, modos_ban = resuelve(Mn, lim_recursos, recursos_modo, coste_rnr, rnr_modo, coste_fijo, tiempo_modo, predecesores, n_experimentos, pdefecto)
+        pareto_set, modos_ban = resuelve(Mn, lim_recursos, recursos_modo, coste_rnr, rnr_modo, coste_fijo, tiempo_modo, predecesores, n_experimentos, pdefecto, opciones = {"carrera": carrera})
     except Exception as e:
         exc_type, exc_obj, exc_tb = sys.exc_info()
         fname = os.path.split(exc_tb.tb_frame.f_code.co_filename)[1]
@@ -506,7 +506,7 @@ def ejecutar_algoritmo(Mn, lim_recursos, recursos_modo, coste_rnr, rnr_modo, cos
 
 
 
-def pantalla_carga(Mn, lim_recursos, recursos_modo, coste_rnr, rnr_modo, coste_fijo, tiempo_modo, predecesores, n_experimentos, pdefecto):
+def pantalla_carga(Mn, lim_recursos, recursos_modo, coste_rnr, rnr_modo, coste_fijo, tiempo_modo, predecesores, n_experimentos, pdefecto, carrera = False):
     """Pantalla de carga con animacion en formato .GIF que avisara cuando los algoritmos hayan acabado su ejecucion
     """
 
@@ -545,7 +545,7 @@ def pantalla_carga(Mn, lim_recursos, recursos_modo, coste_rnr, rnr_modo, coste_f
             queue = Queue()
 
             #Mandamos el metodo ejecutar_algoritmo con los parametros propios y queue para comunicarlo
-            async_result = pool.apply_async(ejecutar_algoritmo, ( Mn, lim_recursos, recursos_modo, coste_rnr, rnr_modo, coste_fijo, tiempo_modo, predecesores, n_experimentos, pdefecto, queue))
+            async_result = pool.apply_async(ejecutar_algoritmo, ( Mn, lim_recursos, recursos_modo, coste_rnr, rnr_modo, coste_fijo, tiempo_modo, predecesores, n_experimentos, pdefecto, queue, carrera))
 
 
             #Mientras no exista comunicacion, queue este vacio
@@ -815,7 +815,7 @@ if __name__ == "__main__":
     #-----Cuarta pantalla: tipo de ejecucion y num. de experimentos
     if continuar:
         try:
-            pdefecto, n_experimentos = cuarta_pantalla()
+            pdefecto, n_experimentos, carrera = cuarta_pantalla()
 
         except:
             continuar = False
@@ -824,7 +824,7 @@ if __name__ == "__main__":
     #-----Quinta pantalla: pantalla de carga y modos prohibidos
     if continuar:
         try:
-            resultados, modos_ban = pantalla_carga(Mn, lim_rr, recursos_modo, coste_rnr, rnr_modo, coste_fijo, dias_modo, predecesores, n_experimentos, pdefecto)
+            resultados, modos_ban = pantalla_carga(Mn, lim_rr, recursos_modo, coste_rnr, rnr_modo, coste_fijo, dias_modo, predecesores, n_experimentos, pdefecto, carrera)
 
         except:
             continuar = False
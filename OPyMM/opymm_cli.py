@@ -0,0 +1,124 @@
+#Punto de entrada sin interfaz grafica para resolver una instancia desde la linea de comandos:
+#
+#    python opymm_cli.py instancia.mm --experimentos 2 --semilla 7 --salida soluciones.json
+#
+#La instancia puede ser un .mm de PSPLIB/MMLIB o un .json guardado con instancias.guarda_json.
+#Las soluciones se escriben en JSON (por defecto, en la salida estandar) o en CSV con una fila por
+#solucion y actividad.
+
+import argparse
+import contextlib
+import csv
+import json
+import sys
+from random import Random
+
+from instancias import lee_instancia
+from mmrcpsp import Cromosoma, resuelve, decodifica, modos_reales
+
+
+def optimiza(instancia, n_experimentos = 1, pdefecto = True, semilla = None, **opciones):
+    """Resuelve una instancia (diccionario de lee_instancia) y devuelve una lista de soluciones ordenadas por tiempo.
+    Cada solucion es un diccionario con tiempo, coste, el modo real de cada actividad y su dia de comienzo.
+    Los argumentos adicionales son opciones de resuelve (ver OPCIONES_RESUELVE)
+    """
+
+    pareto_set, modos_ban = resuelve(instancia["Mn"], instancia["lim_recursos"], instancia["recursos_modo"], instancia["coste_rnr"],
+                                     instancia["rnr_modo"], instancia["coste_fijo"], instancia["dias_modo"], instancia["predecesores"],
+                                     n_experimentos, pdefecto, opciones = dict(opciones, semilla = semilla))
+
+    soluciones = []
+    for indiv in sorted(pareto_set, key = lambda indiv: tuple(indiv.fitness)):
+        modos = modos_reales(indiv.candidate.m, modos_ban)
+
+        #Se decodifica con los datos originales y los modos reales, igual que en la interfaz grafica
+        actividad_dia = decodifica(Cromosoma(indiv.candidate.I, modos), instancia["predecesores"], instancia["lim_recursos"],
+                                   instancia["recursos_modo"], instancia["dias_modo"])
+        comienzos = [dia for _, dia in sorted(actividad_dia)]
+
+        soluciones.append({"tiempo": indiv.fitness[0], "coste": indiv.fitness[1], "modos": modos, "comienzos": comienzos})
+
+    return soluciones
+
+
+def escribe_json(soluciones, f, **cabecera):
+    json.dump(dict(cabecera, soluciones = soluciones), f, indent = 1)
+
+
+def escribe_csv(soluciones, f):
+    csv_writer = csv.writer(f, delimiter=',', quotechar='"', quoting=csv.QUOTE_MINIMAL)
+    csv_writer.writerow(["solucion", "tiempo", "coste", "actividad", "modo", "comienzo"])
+
+    for i, sol in enumerate(soluciones):
+        for actividad, (modo, comienzo) in enumerate(zip(sol["modos"], sol["comienzos"])):
+            csv_writer.writerow([i, sol["tiempo"], sol["coste"], actividad, modo, comienzo])
+
+
+def argumentos(args = None):
+    parser = argparse.ArgumentParser(description = "Resuelve una instancia MRCPSP bi-objetivo (tiempo, coste) sin interfaz grafica")
+    parser.add_argument("instancia", help = "fichero .mm (PSPLIB/MMLIB) o .json con la instancia")
+    parser.add_argument("--todos", action = "store_true", help = "ejecutar los 20 algoritmos en lugar de los 6 por defecto")
+    parser.add_argument("--algoritmos", type = int, nargs = "+", default = None, help = "numeros (del 1 al 50) de los algoritmos a ejecutar, en lugar de los por defecto")
+    parser.add_argument("--carrera", action = "store_true", help = "con --todos o --algoritmos, descartar por rondas los algoritmos que menos aportan al frente")
+    parser.add_argument("--eta-carrera", type = int, default = 2, help = "en cada ronda de la carrera sigue 1/eta de los algoritmos")
+    parser.add_argument("--mutacion-conjunta", action = "store_true", help = "usar la mutacion conjunta de claves y modos (algoritmos 21 a 30)")
+    parser.add_argument("--experimentos", type = int, default = 1, help = "corridas de cada algoritmo")
+    parser.add_argument("--procesos", type = int, default = 1, help = "procesos que reparten la evaluacion de cada generacion, se ignora si --procesos-corridas es mayor que 1")
+    parser.add_argument("--procesos-corridas", type = int, default = 1, help = "procesos que reparten las corridas")
+    parser.add_argument("--semilla", type = int, default = None, help = "semilla general, aleatoria si no se indica")
+    parser.add_argument("--tiempo", type = float, default = None, help = "presupuesto en segundos: repite corridas hasta agotarlo")
+    parser.add_argument("--evaluaciones", type = int, default = None, help = "presupuesto de evaluaciones: repite corridas hasta agotarlo")
+    parser.add_argument("--ventana-estancamiento", type = int, default = None, help = "para cada corrida si el hipervolumen no mejora en estas generaciones")
+    parser.add_argument("--umbral-estancamiento", type = float, default = 1e-3, help = "mejora relativa minima del hipervolumen en la ventana")
+    parser.add_argument("--tam-archivo", type = int, default = None, help = "maximo de soluciones del conjunto Pareto")
+    parser.add_argument("--dir-compilados", default = None, help = "directorio de la cache de problemas preprocesados")
+    parser.add_argument("--coste-rnr", type = float, nargs = "+", default = None, help = "coste por unidad de cada recurso no renovable (.mm)")
+    parser.add_argument("--formato", choices = ("json", "csv"), default = None, help = "por defecto, segun la extension de --salida o json")
+    parser.add_argument("--salida", default = None, help = "fichero de salida, por defecto la salida estandar")
+
+    args = parser.parse_args(args)
+    if args.algoritmos is not None and not all(1 <= alg <= 50 for alg in args.algoritmos):
+        parser.error("los algoritmos van del 1 al 50")
+
+    return args
+
+
+def main(args = None):
+    args = argumentos(args)
+
+    if args.coste_rnr is not None:
+        instancia = lee_instancia(args.instancia, coste_rnr = args.coste_rnr)
+    else:
+        instancia = lee_instancia(args.instancia)
+
+    semilla = args.semilla if args.semilla is not None else Random().randrange(2**32)
+
+    formato = args.formato
+    if formato is None:
+        formato = "csv" if args.salida is not None and args.salida.lower().endswith(".csv") else "json"
+
+    #El progreso de resuelve va a la salida de errores para no mezclarlo con las soluciones
+    with contextlib.redirect_stdout(sys.stderr):
+        soluciones = optimiza(instancia, args.experimentos, not args.todos, semilla,
+                              n_procesos = args.procesos, procesos_corridas = args.procesos_corridas,
+                              tam_archivo = args.tam_archivo, dir_compilados = args.dir_compilados,
+                              tiempo_max = args.tiempo, evaluaciones_max = args.evaluaciones,
+                              ventana_estancamiento = args.ventana_estancamiento, umbral_estancamiento = args.umbral_estancamiento,
+                              carrera = args.carrera, eta_carrera = args.eta_carrera, mutacion_conjunta = args.mutacion_conjunta,
+                              algoritmos = None if args.algoritmos is None else [alg - 1 for alg in args.algoritmos])
+
+    f = open(args.salida, "w", newline = "") if args.salida is not None else sys.stdout
+    try:
+        if formato == "csv":
+            escribe_csv(soluciones, f)
+        else:
+            escribe_json(soluciones, f, instancia = args.instancia, semilla = semilla)
+    finally:
+        if f is not sys.stdout:
+            f.close()
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
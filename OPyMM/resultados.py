@@ -0,0 +1,139 @@
+import glob
+import os
+import time
+
+import numpy as np
+
+
+#Columnas del almacen ademas de objetivos, que es un array (filas x objetivos), y su tipo.
+#semilla = -1 indica que no se conoce la semilla de la corrida
+COLUMNAS = {
+    "instancia": str,
+    "configuracion": np.int16,
+    "semilla": np.int64,
+    "corrida": np.int32,
+    "generacion": np.int32
+}
+
+
+class AlmacenResultados:
+    """ Almacen columnar de resultados en un directorio de lotes .npz, una fila por solucion con la instancia,
+        la configuracion (indice en tabla_algoritmos), la semilla, la corrida, la generacion y los objetivos.
+
+        Las filas se acumulan en memoria y se escriben por lotes de tam_lote filas o al llamar a vuelca.
+        Cada lote es un fichero nuevo, escrito de forma atomica, asi varios procesos o sesiones pueden
+        añadir resultados al mismo almacen. Se puede usar con with para volcar lo pendiente al salir
+    """
+
+    def __init__(self, ruta, tam_lote = 100000):
+
+        self.ruta = ruta
+        self.tam_lote = tam_lote
+        self.pendientes = []
+        self.n_pendientes = 0
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, *excepcion):
+        self.vuelca()
+
+
+    def anade(self, instancia, configuracion, semilla, corrida, generacion, objetivos):
+        """ Añade las soluciones de una corrida, objetivos es un array (soluciones x objetivos)
+        """
+
+        objetivos = np.asarray(objetivos, dtype = float)
+        objetivos = objetivos.reshape(len(objetivos), -1)
+        n = len(objetivos)
+
+        bloque = {columna: np.full(n, np.array(valor, dtype = COLUMNAS[columna])) for columna, valor in
+                  zip(COLUMNAS, (instancia, configuracion, semilla, corrida, generacion))}
+        bloque["objetivos"] = objetivos
+
+        self.pendientes.append(bloque)
+        self.n_pendientes += n
+
+        if self.n_pendientes >= self.tam_lote:
+            self.vuelca()
+
+        return 0
+
+
+    def vuelca(self):
+        """ Escribe las filas pendientes como un nuevo lote
+        """
+
+        if self.n_pendientes == 0:
+            return 0
+
+        columnas = {columna: np.concatenate([b[columna] for b in self.pendientes]) for columna in self.pendientes[0]}
+
+        os.makedirs(self.ruta, exist_ok = True)
+        nombre = os.path.join(self.ruta, "lote_{}_{}".format(os.getpid(), time.time_ns()))
+
+        with open(nombre + ".tmp", "wb") as f:
+            np.savez(f, **columnas)
+        os.replace(nombre + ".tmp", nombre + ".npz")
+
+        self.pendientes = []
+        self.n_pendientes = 0
+
+        return 0
+
+
+def importa_csv(almacen, ruta_csv, instancia, configuracion, tam_poblacion = 100, generacion = 100):
+    """ Añade al almacen un .csv antiguo con columnas tiempo,coste en el que las poblaciones finales de las
+        corridas van una detras de otra, tam_poblacion filas por corrida. La semilla no se conoce
+    """
+
+    objetivos = np.loadtxt(ruta_csv, delimiter = ",", skiprows = 1, ndmin = 2)
+
+    for corrida, inicio in enumerate(range(0, len(objetivos), tam_poblacion)):
+        almacen.anade(instancia, configuracion, -1, corrida, generacion, objetivos[inicio:inicio + tam_poblacion])
+
+    return 0
+
+
+def lee_resultados(ruta):
+    """ Lee todos los lotes de un almacen y devuelve un diccionario columna -> array
+    """
+
+    lotes = []
+    for fichero in sorted(glob.glob(os.path.join(ruta, "lote_*.npz"))):
+        with np.load(fichero) as lote:
+            lotes.append({columna: lote[columna] for columna in lote.files})
+
+    if len(lotes) == 0:
+        tabla = {columna: np.zeros(0, dtype = tipo) for columna, tipo in COLUMNAS.items()}
+        tabla["objetivos"] = np.zeros((0, 2))
+        return tabla
+
+    return {columna: np.concatenate([lote[columna] for lote in lotes]) for columna in lotes[0]}
+
+
+def divide_corridas(tabla):
+    """ Separa las filas de la tabla por corrida (instancia, configuracion, semilla, corrida) y devuelve
+        una lista de pares (clave, objetivos) en orden de clave
+    """
+
+    n = len(tabla["objetivos"])
+    if n == 0:
+        return []
+
+    columnas = [tabla[columna] for columna in ("instancia", "configuracion", "semilla", "corrida")]
+    orden = np.lexsort(columnas[::-1])
+
+    #Empieza una corrida donde cambia alguna de las columnas de la clave
+    cambia = np.zeros(n, dtype = bool)
+    cambia[0] = True
+    for valores in columnas:
+        valores = valores[orden]
+        cambia[1:] |= valores[1:] != valores[:-1]
+
+    inicios = np.flatnonzero(cambia)
+    claves = [tuple(valores[orden[inicio]].item() for valores in columnas) for inicio in inicios]
+
+    return list(zip(claves, np.split(tabla["objetivos"][orden], inicios[1:])))
@@ -0,0 +1,64 @@
+import os
+
+import numpy as np
+
+from instancias import lee_instancia
+from mmrcpsp import Cromosoma, Poblacion, Problema
+
+
+INSTANCIA = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Experimentacion", "instancias", "n356_1.json")
+
+
+def _cromosomas(problema, n, semilla):
+    generador = np.random.default_rng(semilla)
+    n_acts = len(problema.n_modos)
+
+    return [Cromosoma(generador.random(n_acts), (generador.random(n_acts)*problema.n_modos).astype(int)) for _ in range(n)]
+
+
+def _fitness(problema, cromosomas):
+    return [tuple(f) for f in problema.evaluador(cromosomas, {})]
+
+
+def test_aciertos_y_repetidos_en_el_lote():
+    problema = Problema(**lee_instancia(INSTANCIA), tam_cache = 10)
+    a, b = _cromosomas(problema, 2, 1)
+
+    #Mismo orden de claves y mismos modos que a: misma firma aunque las claves cambien
+    a_escalado = Cromosoma(a.I/2, a.m)
+
+    fitness = _fitness(problema, [a, a, b, a_escalado])
+    assert problema.estadisticas_cache() == {"aciertos": 2, "fallos": 2, "tasa_aciertos": 0.5, "tamaño": 2}
+    assert fitness[0] == fitness[1] == fitness[3]
+
+    antes = problema.estadisticas_cache()
+    assert _fitness(problema, [b]) == [fitness[2]]
+    assert problema.estadisticas_cache(antes) == {"aciertos": 1, "fallos": 0, "tasa_aciertos": 1.0, "tamaño": 2}
+
+
+def test_expulsa_la_menos_usada_recientemente():
+    problema = Problema(**lee_instancia(INSTANCIA), tam_cache = 3)
+    a, b, c, d = _cromosomas(problema, 4, 2)
+
+    _fitness(problema, [a, b])
+    _fitness(problema, [a])
+    #b es la menos usada recientemente y sale al entrar d
+    _fitness(problema, [c, d])
+    assert list(problema.cache) == Poblacion.de_cromosomas([a, c, d]).firmas()
+
+    antes = problema.estadisticas_cache()
+    _fitness(problema, [b])
+    assert problema.estadisticas_cache(antes)["fallos"] == 1
+    assert list(problema.cache) == Poblacion.de_cromosomas([c, d, b]).firmas()
+
+
+def test_con_cache_y_sin_cache_coinciden():
+    con_cache = Problema(**lee_instancia(INSTANCIA), tam_cache = 5)
+    sin_cache = Problema(**lee_instancia(INSTANCIA), tam_cache = 0)
+    cromosomas = _cromosomas(con_cache, 20, 3)
+
+    #Varias pasadas para que haya aciertos y expulsiones
+    for _ in range(3):
+        assert _fitness(con_cache, cromosomas) == _fitness(sin_cache, cromosomas)
+    assert len(con_cache.cache) == 5
+    assert sin_cache.estadisticas_cache()["aciertos"] + sin_cache.estadisticas_cache()["fallos"] == 0
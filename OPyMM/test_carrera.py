@@ -0,0 +1,29 @@
+import numpy as np
+import pytest
+
+from mmrcpsp import experimentos_carrera
+
+
+@pytest.mark.parametrize("n_algs, n_experimentos, eta", [(20, 10, 2), (20, 100, 3), (6, 10, 2), (20, 3, 2), (2, 2, 2), (10, 50, 4)])
+def test_cada_ronda_anade_corridas_y_descarta(n_algs, n_experimentos, eta):
+    rondas = experimentos_carrera(n_algs, n_experimentos, eta)
+    supervivientes = [s for s, _ in rondas]
+    experimentos = [e for _, e in rondas]
+
+    assert supervivientes[0] == n_algs and supervivientes[-1] == 1
+    assert experimentos[0] >= 1 and experimentos[-1] == n_experimentos
+
+    #Ninguna ronda descarta algoritmos sin haberles hecho correr algun experimento nuevo
+    assert np.all(np.diff(experimentos) > 0)
+    assert np.all(np.diff(supervivientes) < 0)
+
+
+def test_halving_con_eta_2():
+    assert experimentos_carrera(20, 10) == [(20, 1), (10, 2), (5, 3), (3, 4), (2, 5), (1, 10)]
+
+
+def test_sin_experimentos_para_todas_las_rondas():
+    #Con 3 experimentos solo caben 3 rondas: la ultima pasa directamente a un algoritmo
+    assert experimentos_carrera(20, 3) == [(20, 1), (10, 2), (1, 3)]
+    assert experimentos_carrera(20, 1) == [(20, 1)]
+    assert experimentos_carrera(1, 5) == [(1, 5)]
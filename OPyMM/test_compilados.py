@@ -0,0 +1,52 @@
+import copy
+import os
+from random import Random
+
+import numpy as np
+
+from instancias import lee_instancia
+from mmrcpsp import Problema
+
+
+INSTANCIA = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Experimentacion", "instancias", "j3064_10.json")
+
+
+def test_reutiliza_el_problema_compilado(tmp_path, monkeypatch):
+    instancia = lee_instancia(INSTANCIA)
+
+    original = Problema(**instancia, tam_cache = 0)
+    guardado = Problema(**instancia, tam_cache = 0, dir_compilados = str(tmp_path))
+    assert len(os.listdir(tmp_path)) == 1
+
+    #La segunda carga con el mismo contenido no preprocesa: sale de la cache
+    def sin_preprocesar(self):
+        raise AssertionError("se ha vuelto a preprocesar")
+    monkeypatch.setattr(Problema, "preprocesamiento", sin_preprocesar)
+
+    cargado = Problema(**copy.deepcopy(instancia), tam_cache = 0, dir_compilados = str(tmp_path))
+    assert len(os.listdir(tmp_path)) == 1
+
+    for problema in (guardado, cargado):
+        assert problema.modos_ban == original.modos_ban
+        assert problema.Mn == original.Mn
+        assert problema.lim_recursos == original.lim_recursos
+        for nombre in ("dias_matriz", "recursos_matriz", "coste_matriz", "n_modos", "lim_vector"):
+            assert np.array_equal(getattr(problema, nombre), getattr(original, nombre))
+
+    poblacion = original.genera_poblacion(Random(1), 30)
+    assert cargado.evalua_poblacion(poblacion.claves, poblacion.modos) == original.evalua_poblacion(poblacion.claves, poblacion.modos)
+
+
+def test_otra_instancia_tiene_otra_entrada(tmp_path):
+    instancia = lee_instancia(INSTANCIA)
+    Problema(**instancia, tam_cache = 0, dir_compilados = str(tmp_path))
+
+    otra = copy.deepcopy(instancia)
+    otra["lim_recursos"][0] += 1
+    Problema(**otra, tam_cache = 0, dir_compilados = str(tmp_path))
+
+    otra_coste = copy.deepcopy(instancia)
+    otra_coste["coste_rnr"][0] += 1
+    Problema(**otra_coste, tam_cache = 0, dir_compilados = str(tmp_path))
+
+    assert len(os.listdir(tmp_path)) == 3
@@ -0,0 +1,154 @@
+import copy
+import os
+from random import Random
+
+import inspyred
+import numpy as np
+
+from instancias import lee_instancia
+from mmrcpsp import Problema, Poblacion, cruce_n_puntos, cruce_uniforme, tabla_algoritmos
+
+
+INSTANCIA = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Experimentacion", "instancias", "n356_1.json")
+
+
+class _Algoritmo:
+    """Sustituto del algoritmo de inspyred: solo la poblacion actual, que es lo que consultan los operadores
+    """
+
+    def __init__(self, population):
+        self.population = population
+
+
+def _poblacion_evaluada(problema, n, semilla):
+    candidatos = problema.genera_poblacion(Random(semilla), n).cromosomas()
+    poblacion = []
+    for candidato, fitness in zip(candidatos, problema.evaluador(candidatos, {})):
+        indiv = inspyred.ec.Individual(candidato, maximize = False)
+        indiv.fitness = fitness
+        poblacion.append(indiv)
+
+    return poblacion
+
+
+def _cruza(problema, poblacion, semilla, **args):
+    grupo = [copy.deepcopy(indiv.candidate) for indiv in poblacion]
+    hijos = problema.cruce_sesgado(Random(semilla), grupo, dict(args, _ec = _Algoritmo(poblacion)))
+
+    return Poblacion.de_cromosomas(hijos)
+
+
+def test_cruce_sesgado_no_depende_de_la_cache():
+    instancia = lee_instancia(INSTANCIA)
+    sin_cache = Problema(**instancia, tam_cache = 0)
+    con_cache = Problema(**instancia, tam_cache = 10000)
+
+    poblacion = _poblacion_evaluada(sin_cache, 60, 1)
+
+    #La cache de con_cache tiene otros cromosomas, como tras corridas anteriores en el mismo proceso
+    _poblacion_evaluada(con_cache, 60, 2)
+
+    a = _cruza(sin_cache, poblacion, 7)
+    b = _cruza(con_cache, poblacion, 7)
+
+    assert np.array_equal(a.claves, b.claves)
+    assert np.array_equal(a.modos, b.modos)
+
+
+def test_cruce_sesgado_elige_al_que_domina():
+    problema = Problema(**lee_instancia(INSTANCIA), tam_cache = 0)
+    poblacion = _poblacion_evaluada(problema, 60, 3)
+
+    #Con sesgo 1 los dos hijos son copias del elite
+    hijos = _cruza(problema, poblacion, 5, sesgo_elite = 1.0)
+
+    for k in range(len(poblacion)//2):
+        madre, padre = poblacion[2*k], poblacion[2*k + 1]
+        fm, fp = list(madre.fitness), list(padre.fitness)
+        elite = padre if all(p <= m for p, m in zip(fp, fm)) and fp != fm else madre
+
+        for hijo in (2*k, 2*k + 1):
+            assert np.array_equal(hijos.claves[hijo], elite.candidate.I)
+            assert np.array_equal(hijos.modos[hijo], elite.candidate.m)
+
+
+def test_cruce_sesgado_sin_algoritmo_evalua_los_progenitores():
+    problema = Problema(**lee_instancia(INSTANCIA), tam_cache = 0)
+    poblacion = _poblacion_evaluada(problema, 20, 4)
+
+    grupo = Poblacion.de_cromosomas([indiv.candidate for indiv in poblacion])
+    fitness = problema.fitness_progenitores(grupo, {})
+
+    assert fitness == [tuple(indiv.fitness) for indiv in poblacion]
+
+
+def test_tabla_conserva_el_cruce_publicado():
+    algoritmos = tabla_algoritmos(Problema(**lee_instancia(INSTANCIA), tam_cache = 0))
+    n_puntos = list(range(5, 10)) + list(range(15, 20))
+
+    #Los ids publicados mantienen el cruce de inspyred y los nativos solo cambian el operador de cruce
+    for i in n_puntos:
+        assert algoritmos[i][1] is inspyred.ec.variators.n_point_crossover
+    for i, nativo in zip(n_puntos, algoritmos[30:]):
+        assert nativo[1] is cruce_n_puntos
+        assert nativo[:1] + nativo[2:] == algoritmos[i][:1] + algoritmos[i][2:]
+    assert len(algoritmos) == 50
+
+
+def test_tabla_tiene_el_cruce_sesgado():
+    problema = Problema(**lee_instancia(INSTANCIA), tam_cache = 0)
+    algoritmos = tabla_algoritmos(problema)
+    uniformes = list(range(0, 5)) + list(range(10, 15))
+
+    for i, sesgado in zip(uniformes, algoritmos[40:]):
+        assert sesgado[1] == problema.cruce_sesgado
+        assert sesgado[:1] + sesgado[2:] == algoritmos[i][:1] + algoritmos[i][2:]
+
+
+def test_cruce_sesgado_consulta_el_fitness_una_vez():
+    problema = Problema(**lee_instancia(INSTANCIA), tam_cache = 0)
+    poblacion = _poblacion_evaluada(problema, 60, 12)
+
+    llamadas = []
+    consulta = problema.fitness_progenitores
+    problema.fitness_progenitores = lambda grupo, args: llamadas.append(len(grupo)) or consulta(grupo, args)
+
+    _cruza(problema, poblacion, 13)
+
+    assert llamadas == [60]
+
+
+def test_n_point_crossover_de_inspyred_con_cromosomas():
+    problema = Problema(**lee_instancia(INSTANCIA), tam_cache = 0)
+    poblacion = _poblacion_evaluada(problema, 20, 6)
+    grupo = [copy.deepcopy(indiv.candidate) for indiv in poblacion]
+    padres = Poblacion.de_cromosomas(grupo)
+
+    hijos = Poblacion.de_cromosomas(inspyred.ec.variators.n_point_crossover(Random(8), grupo, {'num_crossover_points': 2}))
+
+    #Cada gen de los hijos de una pareja sale de uno de los padres, y entre los dos estan los de ambos
+    assert np.array_equal(np.sort(hijos.claves.reshape(-1, 2, hijos.claves.shape[1]), axis = 1),
+                          np.sort(padres.claves.reshape(-1, 2, padres.claves.shape[1]), axis = 1))
+
+
+def test_hijos_y_mutados_tienen_arrays_propios():
+    problema = Problema(**lee_instancia(INSTANCIA), tam_cache = 0)
+    grupo = [copy.deepcopy(indiv.candidate) for indiv in _poblacion_evaluada(problema, 20, 9)]
+
+    #Ningun superviviente debe mantener viva la memoria de toda su generacion
+    for cruce in (cruce_uniforme, cruce_n_puntos, problema.cruce_sesgado):
+        for hijo in cruce(Random(10), grupo, {'num_crossover_points': 2}):
+            assert hijo.I.base is None and hijo.m.base is None
+
+    for mutacion in (problema.mutacion_modos, problema.mutacion_actividades, problema.mutacion_conjunta):
+        for hijo in mutacion(Random(11), grupo, {'mutation_rate': 1.0}):
+            assert hijo.I.base is None and hijo.m.base is None
+
+
+def test_sin_mutaciones_devuelve_los_mismos_cromosomas():
+    problema = Problema(**lee_instancia(INSTANCIA), tam_cache = 0)
+    grupo = [copy.deepcopy(indiv.candidate) for indiv in _poblacion_evaluada(problema, 10, 14)]
+
+    for mutacion in (problema.mutacion_modos, problema.mutacion_actividades, problema.mutacion_conjunta):
+        hijos = mutacion(Random(15), grupo, {'mutation_rate': 0.0})
+        assert hijos is not grupo and all(h is c for h, c in zip(hijos, grupo))
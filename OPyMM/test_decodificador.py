@@ -0,0 +1,94 @@
+import os
+from random import Random
+
+import numpy as np
+import pytest
+
+from instancias import lee_instancia
+from mmrcpsp import Cromosoma, Problema, calcula_sucesores, decodifica, decodifica_poblacion, rellena_modos
+
+
+DIRECTORIO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Experimentacion", "instancias")
+
+#Instancia a mano con un recurso de 2 unidades: la actividad 1 dura 0 y la 3 espera a la 1 y a la 2
+PEQUEÑA = dict(predecesores = [[], [], [0], [1, 2]],
+               lim_recursos = [2],
+               recursos_modo = [[[1], [2]], [[1]], [[2], [1], [1]], [[2]]],
+               dias_modo = [[2, 1], [0], [3, 1, 2], [1]])
+
+
+def _variante(instancia):
+    """La instancia con 1, 2 o 3 modos por actividad segun su indice y la duracion del primer modo
+       de una de cada cuatro actividades a 0
+    """
+    n_modos = [1 + i % 3 for i in range(len(instancia["dias_modo"]))]
+    dias_modo = [[0 if i % 4 == 0 and k == 0 else d for k, d in enumerate(dias[:n])] for i, (dias, n) in enumerate(zip(instancia["dias_modo"], n_modos))]
+    recursos_modo = [recursos[:n] for recursos, n in zip(instancia["recursos_modo"], n_modos)]
+
+    return dict(predecesores = instancia["predecesores"], lim_recursos = instancia["lim_recursos"], recursos_modo = recursos_modo, dias_modo = dias_modo)
+
+
+def _cromosomas(instancia, n, semilla):
+    """Cromosomas aleatorios con modos validos; las claves salen de pocos valores para que haya empates
+    """
+    generador = np.random.default_rng(semilla)
+    n_modos = np.array([len(dias) for dias in instancia["dias_modo"]])
+
+    claves = generador.integers(0, 4, size = (n, len(n_modos)))/4
+    modos = (generador.random((n, len(n_modos)))*n_modos).astype(int)
+
+    return claves, modos
+
+
+def _comienzos(instancia, claves, modos):
+    """Dia de comienzo de cada actividad segun decodifica, cromosoma a cromosoma
+    """
+    comienzos = np.empty(claves.shape, dtype = int)
+    for i in range(len(claves)):
+        for actividad, dia in decodifica(Cromosoma(claves[i], modos[i]), instancia["predecesores"], instancia["lim_recursos"],
+                                         instancia["recursos_modo"], instancia["dias_modo"]):
+            comienzos[i, actividad] = dia
+
+    return comienzos
+
+
+def _comienzos_poblacion(instancia, claves, modos):
+    sucesores, n_predecesores = calcula_sucesores(instancia["predecesores"])
+
+    return decodifica_poblacion(claves, modos, rellena_modos(instancia["dias_modo"]),
+                                rellena_modos(instancia["recursos_modo"], (len(instancia["lim_recursos"]),)),
+                                instancia["lim_recursos"], sucesores, n_predecesores)
+
+
+@pytest.mark.parametrize("claves, modos, esperado", [
+    #Empate en todas las claves: se elige la de menor indice
+    ([0.5]*4, [0, 0, 0, 0], [0, 0, 2, 5]),
+    ([0.5]*4, [1, 0, 1, 0], [0, 1, 1, 2]),
+    #La 1 va primero y al durar 0 deja sitio a la 0 el mismo dia
+    ([0.1, 0.9, 0.5, 0.5], [1, 0, 1, 0], [0, 0, 1, 2])])
+def test_instancia_a_mano(claves, modos, esperado):
+    claves, modos = np.array([claves]), np.array([modos])
+
+    assert _comienzos(PEQUEÑA, claves, modos).tolist() == [esperado]
+    assert _comienzos_poblacion(PEQUEÑA, claves, modos).tolist() == [esperado]
+
+
+@pytest.mark.parametrize("nombre", ["j3057_9.json", "n356_1.json", "m561_10.json"])
+def test_decodificadores_coinciden(nombre):
+    instancia = lee_instancia(os.path.join(DIRECTORIO, nombre))
+
+    for datos, semilla in ((instancia, 1), (_variante(instancia), 2)):
+        claves, modos = _cromosomas(datos, 50, semilla)
+
+        assert np.array_equal(_comienzos_poblacion(datos, claves, modos), _comienzos(datos, claves, modos))
+
+
+def test_makespan_de_problema_coincide():
+    #Tras el preprocesamiento las actividades tienen distinto numero de modos
+    problema = Problema(**lee_instancia(os.path.join(DIRECTORIO, "j3064_10.json")), tam_cache = 0)
+    assert len(set(problema.Mn)) > 1
+
+    poblacion = problema.genera_poblacion(Random(3), 50)
+    makespans = problema.makespan_poblacion(poblacion.claves, poblacion.modos)
+
+    assert makespans.tolist() == [problema.makespan(cromosoma) for cromosoma in poblacion]
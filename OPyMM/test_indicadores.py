@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+
+from indicadores import contribuciones_hipervolumen, epsilon_aditivo, hipervolumen, igd
+
+
+#Escalera de tres puntos con referencia (4, 4): tres franjas de ancho 1 y alturas 1, 2 y 3
+FRENTE = [(1, 3), (2, 2), (3, 1)]
+REFERENCIA = (4, 4)
+
+
+def test_hipervolumen_escalera():
+    assert hipervolumen(FRENTE, REFERENCIA) == pytest.approx(6.0)
+
+
+def test_hipervolumen_un_punto():
+    assert hipervolumen([(1, 1)], REFERENCIA) == pytest.approx(9.0)
+
+
+def test_hipervolumen_repetidos_y_dominados_no_suman():
+    assert hipervolumen(FRENTE + [(2, 2), (3, 3), (1, 3)], REFERENCIA) == pytest.approx(6.0)
+
+
+def test_hipervolumen_ignora_puntos_mas_alla_de_la_referencia():
+    #(5, 0) queda fuera en el primer objetivo y (0, 5) en el segundo; (4, 0) esta en el borde y no aporta
+    assert hipervolumen([(1, 3), (5, 0), (0, 5), (4, 0)], REFERENCIA) == pytest.approx(3.0)
+    assert hipervolumen([(5, 5)], REFERENCIA) == 0.0
+
+
+def test_hipervolumen_frente_vacio():
+    assert hipervolumen([], REFERENCIA) == 0.0
+    assert hipervolumen(np.zeros((0, 2)), REFERENCIA) == 0.0
+
+
+def test_igd():
+    referencia = [(0, 1), (1, 0)]
+
+    #(0, 2) esta a 1 de (0, 1) y a raiz de 5 de (1, 0)
+    valores = igd([[(0, 2)], referencia, [(0, 1)]], referencia)
+
+    assert valores == pytest.approx([(1 + np.sqrt(5))/2, 0.0, np.sqrt(2)/2])
+
+
+def test_epsilon_aditivo():
+    referencia = [(0, 1), (1, 0)]
+
+    #Un frente que domina a la referencia tiene epsilon negativo
+    valores = epsilon_aditivo([[(0, 2)], [(0.5, 0.5)], referencia, [(-1, -1)]], referencia)
+
+    assert valores == pytest.approx([2.0, 0.5, 0.0, -1.0])
+
+
+def test_igd_y_epsilon_rechazan_frentes_vacios():
+    with pytest.raises(ValueError):
+        igd([FRENTE, []], FRENTE)
+    with pytest.raises(ValueError):
+        epsilon_aditivo([[], FRENTE], FRENTE)
+
+
+def test_contribuciones_a_mano():
+    #El segundo y el cuarto frente son el mismo punto, asi que ninguno aporta nada en exclusiva
+    frentes = [[(1, 3)], [(2, 2)], [(3, 1)], [(2, 2)], []]
+
+    assert contribuciones_hipervolumen(frentes, REFERENCIA) == pytest.approx([1.0, 0.0, 1.0, 0.0, 0.0])
+
+
+def test_contribuciones_igual_a_quitar_cada_frente():
+    generador = np.random.default_rng(0)
+    referencia = (10, 10)
+
+    #Puntos enteros para que haya repetidos entre frentes, alguno mas alla de la referencia y un frente vacio
+    frentes = [generador.integers(0, 12, size = (n, 2)) for n in (5, 1, 8, 0, 3, 6)]
+    total = hipervolumen(np.vstack(frentes), referencia)
+
+    esperadas = [total - hipervolumen(np.vstack(frentes[:i] + frentes[i+1:]), referencia) for i in range(len(frentes))]
+
+    assert contribuciones_hipervolumen(frentes, referencia) == pytest.approx(esperadas)
+
+
+def test_contribuciones_de_un_solo_frente():
+    assert contribuciones_hipervolumen([FRENTE], REFERENCIA) == pytest.approx([6.0])
+    assert contribuciones_hipervolumen([[]], REFERENCIA) == pytest.approx([0.0])
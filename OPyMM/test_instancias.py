@@ -0,0 +1,74 @@
+import io
+import os
+
+import pytest
+
+from instancias import lee_instancia, lee_mm, recorre_instancias
+from mmrcpsp import Problema
+
+
+DATOS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "datos_prueba")
+
+#j10_recortada.mm sin las actividades ficticias 1 y 6: los trabajos 2 a 5 pasan a ser las actividades 0 a 3
+J10 = {
+    "recursos_modo": [[[4, 0], [0, 2], [1, 1]], [[3, 3], [2, 0]], [[0, 5]], [[2, 2], [1, 1], [0, 1]]],
+    "dias_modo": [[3, 5, 6], [2, 4], [1], [2, 3, 7]],
+    "lim_recursos": [6, 7],
+    "Mn": [3, 2, 1, 3],
+    "predecesores": [[], [], [], [0, 1]],
+    "coste_fijo": [[0, 0, 0], [0, 0], [0], [0, 0, 0]],
+    "coste_rnr": [1, 1],
+    "rnr_modo": [[[5, 0], [0, 3], [2, 2]], [[0, 4], [1, 1]], [[6, 0]], [[0, 0], [3, 0], [0, 1]]]
+}
+
+#mmlib_recortada.mm: columnas R1, D1 y N1, separadas por tabuladores y con lineas de modo partidas.
+#El recurso D1 es renovable y no renovable a la vez
+MMLIB = {
+    "recursos_modo": [[[3, 2], [5, 4]], [[1, 1]]],
+    "dias_modo": [[4, 2], [3]],
+    "lim_recursos": [8, 6],
+    "Mn": [2, 1],
+    "predecesores": [[], []],
+    "coste_fijo": [[0, 0], [0]],
+    "coste_rnr": [1, 1],
+    "rnr_modo": [[[2, 1], [4, 0]], [[1, 2]]]
+}
+
+
+def test_lee_j10():
+    assert lee_mm(os.path.join(DATOS, "j10_recortada.mm")) == J10
+
+
+def test_lee_mmlib_con_lineas_partidas():
+    assert lee_instancia(os.path.join(DATOS, "mmlib_recortada.mm")) == MMLIB
+
+
+def test_sin_quitar_ficticias():
+    instancia = lee_mm(os.path.join(DATOS, "j10_recortada.mm"), quita_ficticias = False)
+
+    assert instancia["dias_modo"] == [[0]] + J10["dias_modo"] + [[0]]
+    assert instancia["predecesores"] == [[], [0], [0], [0], [1, 2], [3, 4]]
+
+
+def test_costes_dados():
+    instancia = lee_mm(os.path.join(DATOS, "j10_recortada.mm"), coste_rnr = [2, 3], coste_fijo = [[1, 2, 3], [4, 5], [6], [7, 8, 9]])
+
+    assert instancia["coste_rnr"] == [2, 3]
+    assert instancia["coste_fijo"] == [[1, 2, 3], [4, 5], [6], [7, 8, 9]]
+
+
+def test_formato_incorrecto():
+    with pytest.raises(ValueError):
+        lee_mm(io.StringIO("PRECEDENCE RELATIONS:\n1 1 0\n"))
+
+
+def test_recorre_instancias_en_orden():
+    rutas = [os.path.basename(ruta) for ruta, _ in recorre_instancias(DATOS)]
+
+    assert rutas == ["j10_recortada.mm", "mmlib_recortada.mm"]
+
+
+def test_problema_desde_mm():
+    problema = Problema(**lee_mm(os.path.join(DATOS, "j10_recortada.mm")), tam_cache = 0)
+
+    assert len(problema.recursos_modo) == 4
@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+
+from is_pareto import ArchivoPareto, devuelve_pareto_from_file, devuelve_pareto_from_lists, is_pareto
+
+
+def _pareto_fuerza_bruta(sols):
+    """No dominada por ninguna otra y, entre repetidas, la primera
+    """
+    mascara = []
+    for i, s in enumerate(sols):
+        dominada = any(np.all(o <= s) and np.any(o < s) for o in sols)
+        repetida = any(np.array_equal(o, s) for o in sols[:i])
+        mascara.append(not dominada and not repetida)
+
+    return np.array(mascara, dtype = bool)
+
+
+class _Solucion:
+    def __init__(self, fitness):
+        self.fitness = fitness
+
+
+@pytest.mark.parametrize("n_obj", [2, 3])
+def test_is_pareto_igual_que_fuerza_bruta(n_obj):
+    generador = np.random.default_rng(n_obj)
+
+    #Valores enteros pequeños para que haya muchos repetidos y empates en un objetivo
+    for n in (1, 2, 5, 30, 200):
+        sols = generador.integers(0, 8, size = (n, n_obj))
+        assert np.array_equal(is_pareto(sols), _pareto_fuerza_bruta(sols))
+
+
+def test_is_pareto_casos_limite():
+    assert is_pareto(np.zeros((0, 2))).shape == (0,)
+    assert is_pareto([(3, 4)]).tolist() == [True]
+    assert is_pareto([(1, 1), (1, 1), (1, 1)]).tolist() == [True, False, False]
+
+    #Empate en un objetivo: domina la que mejora el otro
+    assert is_pareto([(1, 2), (1, 1), (2, 1)]).tolist() == [False, True, False]
+
+
+def test_archivo_guarda_el_frente_de_todo_lo_insertado():
+    generador = np.random.default_rng(4)
+    puntos = generador.integers(0, 20, size = (300, 2))
+
+    archivo = ArchivoPareto()
+    for bloque in np.array_split(puntos, 7):
+        archivo.inserta(_Solucion(tuple(p)) for p in bloque)
+
+    esperado = puntos[is_pareto(puntos)]
+    assert sorted(map(tuple, archivo.puntos.tolist())) == sorted(map(tuple, esperado.tolist()))
+    assert [s.fitness for s in archivo] == [tuple(p) for p in archivo.puntos]
+
+
+@pytest.mark.parametrize("criterio", ["crowding", "epsilon"])
+def test_archivo_acotado(criterio):
+    #Frente lineal de 50 puntos, todos no dominados
+    puntos = [(float(i), float(49 - i)) for i in range(50)]
+
+    archivo = ArchivoPareto(tam_max = 10, criterio = criterio).inserta(_Solucion(p) for p in puntos)
+
+    assert len(archivo) <= 10
+    assert np.all(is_pareto(archivo.puntos))
+    if criterio == "crowding":
+        #Los extremos tienen distancia de crowding infinita y no se descartan
+        assert {(0.0, 49.0), (49.0, 0.0)} <= set(map(tuple, archivo.puntos.tolist()))
+
+
+def test_archivo_criterio_desconocido():
+    with pytest.raises(ValueError):
+        ArchivoPareto(criterio = "aleatorio")
+
+
+def test_devuelve_pareto_de_listas_y_ficheros(tmp_path):
+    tiempo, coste = [3, 1, 2, 2], [1, 3, 2, 4]
+
+    assert devuelve_pareto_from_lists(tiempo, coste) == [[3, 1], [1, 3], [2, 2]]
+
+    (tmp_path / "x.txt").write_text(str(tiempo))
+    (tmp_path / "y.txt").write_text(str(coste))
+    assert devuelve_pareto_from_file(tmp_path / "x.txt", tmp_path / "y.txt") == [(3.0, 1.0), (1.0, 3.0), (2.0, 2.0)]
@@ -0,0 +1,77 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from instancias import lee_instancia
+from mmrcpsp import MAX_GENERACIONES, OPCIONES_RESUELVE, Problema, ejecuta_corrida, opciones_resuelve
+
+
+DIRECTORIO = os.path.dirname(os.path.abspath(__file__))
+INSTANCIA = os.path.join(DIRECTORIO, "..", "Experimentacion", "instancias", "n356_1.json")
+
+
+def _cli(*args, timeout = 120):
+    """Ejecuta opymm_cli.py en otro proceso y devuelve su salida JSON y el progreso. Si se bloquea, timeout hace
+    fallar el test
+    """
+    salida = subprocess.run([sys.executable, os.path.join(DIRECTORIO, "opymm_cli.py"), INSTANCIA] + list(args),
+                            capture_output = True, text = True, timeout = timeout, check = True)
+
+    return json.loads(salida.stdout), salida.stderr
+
+
+def test_procesos_y_procesos_corridas_a_la_vez():
+    resultado, progreso = _cli("--evaluaciones", "1200", "--procesos", "2", "--procesos-corridas", "2", "--semilla", "1")
+
+    assert len(resultado["soluciones"]) > 0
+
+    #Las estadisticas de la cache de cada corrida llegan desde los trabajadores
+    assert "aciertos de cache" in progreso
+    total = [linea for linea in progreso.splitlines() if linea.startswith("Cache de fitness")][-1]
+    assert "'fallos': 0," not in total
+
+
+def test_algoritmos_con_cruce_sesgado():
+    resultado, _ = _cli("--algoritmos", "41", "46", "--evaluaciones", "1200", "--semilla", "2")
+
+    assert len(resultado["soluciones"]) > 0
+
+
+def test_corrida_no_pasa_de_su_presupuesto():
+    problema = Problema(**lee_instancia(INSTANCIA), tam_cache = 0)
+
+    #Algoritmo 3: poblacion inicial de 100 y 100 descendientes por generacion, con 250 solo cabe una generacion
+    _, generaciones, evaluaciones = ejecuta_corrida(problema, 2, 5, evaluaciones_corrida = 250)
+    assert (generaciones, evaluaciones) == (1, 200)
+
+    _, generaciones, evaluaciones = ejecuta_corrida(problema, 2, 5, evaluaciones_corrida = 100)
+    assert (generaciones, evaluaciones) == (0, 100)
+
+    #Algoritmo 2: un solo progenitor por generacion, sin pareja no hay descendientes que evaluar
+    _, generaciones, evaluaciones = ejecuta_corrida(problema, 1, 5, evaluaciones_corrida = 100)
+    assert (generaciones, evaluaciones) == (MAX_GENERACIONES, 100)
+
+
+def test_presupuesto_igual_en_serie_y_en_paralelo():
+    #El algoritmo 2 usa 100 evaluaciones y el 3 se queda con 2450, asi que para en la generacion 23;
+    #los 50 que sobran no llegan para otra corrida
+    serie, progreso_serie = _cli("--algoritmos", "2", "3", "--evaluaciones", "2550", "--semilla", "4")
+    paralelo, progreso_paralelo = _cli("--algoritmos", "2", "3", "--evaluaciones", "2550", "--semilla", "4", "--procesos-corridas", "2")
+
+    assert progreso_serie.count("concluido en la generacion") == progreso_paralelo.count("concluido en la generacion") == 2
+    assert "concluido en la generacion  23 " in progreso_serie and "concluido en la generacion  23 " in progreso_paralelo
+    assert sorted(map(str, serie["soluciones"])) == sorted(map(str, paralelo["soluciones"]))
+
+
+def test_opciones_resuelve():
+    assert opciones_resuelve() == OPCIONES_RESUELVE
+
+    opciones = opciones_resuelve({"carrera": True, "semilla": 3})
+    assert opciones == dict(OPCIONES_RESUELVE, carrera = True, semilla = 3)
+    assert OPCIONES_RESUELVE["carrera"] is False
+
+    with pytest.raises(ValueError):
+        opciones_resuelve({"n_proceso": 2})
@@ -0,0 +1,48 @@
+import numpy as np
+
+from resultados import AlmacenResultados, divide_corridas, importa_csv, lee_resultados
+
+
+def test_escribe_reabre_y_lee(tmp_path):
+    ruta = str(tmp_path / "almacen")
+
+    #Lotes de 150 filas: la primera sesion escribe dos lotes, uno al llenarse y otro al salir del with
+    with AlmacenResultados(ruta, tam_lote = 150) as almacen:
+        for corrida in range(3):
+            almacen.anade("j3057_9", 4, 77, corrida, 100, np.full((100, 2), corrida))
+
+    with AlmacenResultados(ruta) as almacen:
+        almacen.anade("n356_1", 21, 5, 0, 42, [(1.0, 2.0), (3.0, 4.0)])
+
+    tabla = lee_resultados(ruta)
+
+    assert len(tabla["objetivos"]) == 302
+    assert set(tabla) == {"instancia", "configuracion", "semilla", "corrida", "generacion", "objetivos"}
+
+    corridas = divide_corridas(tabla)
+    assert [clave for clave, _ in corridas] == [("j3057_9", 4, 77, 0), ("j3057_9", 4, 77, 1), ("j3057_9", 4, 77, 2), ("n356_1", 21, 5, 0)]
+    assert np.array_equal(corridas[1][1], np.full((100, 2), 1.0))
+    assert corridas[3][1].tolist() == [[1.0, 2.0], [3.0, 4.0]]
+    assert tabla["generacion"][tabla["instancia"] == "n356_1"].tolist() == [42, 42]
+
+
+def test_almacen_vacio(tmp_path):
+    tabla = lee_resultados(str(tmp_path / "no_existe"))
+
+    assert tabla["objetivos"].shape == (0, 2)
+    assert divide_corridas(tabla) == []
+
+
+def test_importa_csv(tmp_path):
+    ruta_csv = tmp_path / "crossover_uniform.csv"
+    objetivos = np.arange(500, dtype = float).reshape(250, 2)
+    np.savetxt(ruta_csv, objetivos, delimiter = ",", header = "tiempo,coste", comments = "")
+
+    ruta = str(tmp_path / "almacen")
+    with AlmacenResultados(ruta) as almacen:
+        importa_csv(almacen, str(ruta_csv), "m561_10", 3)
+
+    #Corridas de 100 filas seguidas, la ultima incompleta, sin perder ninguna fila
+    corridas = divide_corridas(lee_resultados(ruta))
+    assert [clave for clave, _ in corridas] == [("m561_10", 3, -1, 0), ("m561_10", 3, -1, 1), ("m561_10", 3, -1, 2)]
+    assert np.array_equal(np.vstack([o for _, o in corridas]), objetivos)